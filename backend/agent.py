@@ -12,22 +12,40 @@ Run with:
 from __future__ import annotations
 
 import argparse
+import copy
+import hashlib
 import json
 import logging
 import os
+import queue
+import selectors
 import signal
 import shutil
 import subprocess
-import tempfile
 import threading
+import time
 import uuid
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from functools import cached_property
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import yaml
-from fastapi import FastAPI, HTTPException, UploadFile, File
+
+try:  # orjson is 2-5x faster than stdlib json on small event objects
+    import orjson
+except ImportError:  # pragma: no cover — optional dependency
+    orjson = None
+
+try:  # in-process git reads skip a fork+exec per dashboard poll
+    import pygit2
+except ImportError:  # pragma: no cover — optional dependency
+    pygit2 = None
+
+from fastapi import FastAPI, HTTPException, Request, Response, UploadFile, File
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import StreamingResponse
 
@@ -40,47 +58,78 @@ from backend.models import (
     PlanReviewRequest,
     TaskCreateRequest,
     TaskDetail,
-    TaskSummary,
     TASK_TYPE_VALUES,
     TaskType,
     WorktreeInfo,
 )
 
-from backend.logging_config import create_task_handler, setup_logging
+from backend.logging_config import begin_task_logging, end_task_logging, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Fast paths for all task-state (de)serialization; orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so except clauses are unchanged.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+if orjson is not None:
+    _json_dumps_bytes = orjson.dumps
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def _json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def _json_dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
 # ---------------------------------------------------------------------------
 # Project directory — single entry point for all project paths
 # ---------------------------------------------------------------------------
 
 @dataclass
 class AgentDir:
-    """Single entry point for accessing project directories."""
+    """Single entry point for accessing project directories.
+
+    Subdirectory paths are cached per instance — hot paths hit these on
+    every poll and Path construction is pure allocation churn. `root` is
+    never reassigned after construction, so the caches cannot go stale.
+    """
     root: Path
 
-    @property
+    @cached_property
     def tasks(self) -> Path:
         return self.root / "tasks"
 
-    @property
+    @cached_property
     def worktrees(self) -> Path:
         return self.root / "worktrees"
 
-    @property
+    @cached_property
     def data(self) -> Path:
         return self.root / "data"
 
-    @property
+    @cached_property
     def logs(self) -> Path:
         return self.root / "logs"
 
-    @property
+    @cached_property
     def uploads(self) -> Path:
         return self.root / "uploads"
 
     def tasks_status(self, status: str) -> Path:
-        return self.tasks / status
+        cache = self.__dict__.setdefault("_status_dirs", {})
+        try:
+            return cache[status]
+        except KeyError:
+            path = cache[status] = self.tasks / status
+            return path
 
     @classmethod
     def resolve(cls, path: str | Path | None = None) -> AgentDir:
@@ -94,6 +143,17 @@ class AgentDir:
 
 agent_dir = AgentDir.resolve()
 
+# Process-lifetime memo of directories already created: per-task callers
+# (event sidecars, log saves, worktree roots) pay a set lookup instead of
+# a mkdir syscall that fails with EEXIST every time.
+_created_dirs: set[Path] = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    if path not in _created_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(path)
+
 # ---------------------------------------------------------------------------
 # Agent configuration
 # ---------------------------------------------------------------------------
@@ -115,7 +175,9 @@ class ChatConfig:
 @dataclass
 class AgentConfig:
     max_parallel_workers: int = 5
-    poll_interval_seconds: int = 10
+    # Idle scan interval — task creation wakes the dispatcher immediately,
+    # so this only bounds how often we re-scan for externally added tasks.
+    poll_interval_seconds: int = 30
     claude_code: ClaudeCodeConfig = field(default_factory=ClaudeCodeConfig)
     chat: ChatConfig = field(default_factory=ChatConfig)
     port_range_start: int = 9200
@@ -127,38 +189,105 @@ class AgentConfig:
     max_merge_retries: int = 3
 
 
+# Parsed agent config cache: (path, st_mtime_ns, config). Repeated loads
+# (tests, reloads, --project-dir switches) hit memory unless the file
+# changed on disk.
+_agent_config_cache: tuple[Path, int, AgentConfig] | None = None
+
+# The C loader is ~3x faster than the pure-Python SafeLoader; fall back
+# when libyaml bindings are unavailable.
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YAML_LOADER
+
+    logger.warning(
+        "PyYAML was built without libyaml; using the slower pure-Python "
+        "SafeLoader for agent.yaml"
+    )
+
+
+def _load_raw_config(candidate: Path, st: os.stat_result) -> dict:
+    """Load the raw config dict, preferring a precompiled JSON sidecar.
+
+    YAML parsing dominates cold-start config load; the sidecar
+    (``.{name}.cache.json``, keyed by mtime/size) turns repeat startups
+    into a single ``json.loads``. Sidecar maintenance is best-effort —
+    any failure just falls back to parsing the YAML.
+    """
+    cache_path = candidate.parent / f".{candidate.name}.cache.json"
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+        if cached.get("mtime") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            return cached.get("data") or {}
+    except (OSError, ValueError, AttributeError):
+        pass
+    with open(candidate) as f:
+        raw = yaml.load(f, Loader=_YAML_LOADER) or {}
+    try:
+        tmp = str(cache_path) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps_bytes({"mtime": st.st_mtime_ns, "size": st.st_size, "data": raw}))
+        os.replace(tmp, cache_path)
+    except (OSError, TypeError):
+        pass
+    return raw
+
+
 def _load_agent_config(project_dir: Path) -> AgentConfig:
+    global _agent_config_cache
     for candidate in [project_dir / "agent.yaml", project_dir / "config.yaml"]:
-        if candidate.exists():
-            with open(candidate) as f:
-                raw = yaml.safe_load(f) or {}
-            cc_raw = raw.get("claude_code", {})
-            chat_raw = raw.get("chat", {})
-            return AgentConfig(
-                max_parallel_workers=raw.get("max_parallel_workers", 5),
-                poll_interval_seconds=raw.get("poll_interval_seconds", 10),
-                claude_code=ClaudeCodeConfig(
-                    skip_permissions=cc_raw.get("skip_permissions", True),
-                    output_format=cc_raw.get("output_format", "stream-json"),
-                    verbose=cc_raw.get("verbose", True),
-                    timeout=cc_raw.get("timeout", 600),
-                ),
-                chat=ChatConfig(
-                    model=chat_raw.get("model", "claude-sonnet-4-5-20250929"),
-                    max_tokens=chat_raw.get("max_tokens", 4096),
-                ),
-                port_range_start=raw.get("port_range_start", 9200),
-                port_range_end=raw.get("port_range_end", 9299),
-                test_command=raw.get("test_command", "pytest"),
-                push_to_remote=raw.get("push_to_remote", True),
-                symlink_files=raw.get("symlink_files", []),
-                copy_files=raw.get("copy_files", ["CLAUDE.md", "PROGRESS.md"]),
-                max_merge_retries=raw.get("max_merge_retries", 3),
-            )
+        try:
+            st = candidate.stat()
+        except OSError:
+            continue
+        cache = _agent_config_cache
+        if cache is not None and cache[0] == candidate and cache[1] == st.st_mtime_ns:
+            return cache[2]
+        raw = _load_raw_config(candidate, st)
+        cc_raw = raw.get("claude_code", {})
+        chat_raw = raw.get("chat", {})
+        config = AgentConfig(
+            max_parallel_workers=raw.get("max_parallel_workers", 5),
+            poll_interval_seconds=raw.get("poll_interval_seconds", 30),
+            claude_code=ClaudeCodeConfig(
+                skip_permissions=cc_raw.get("skip_permissions", True),
+                output_format=cc_raw.get("output_format", "stream-json"),
+                verbose=cc_raw.get("verbose", True),
+                timeout=cc_raw.get("timeout", 600),
+            ),
+            chat=ChatConfig(
+                model=chat_raw.get("model", "claude-sonnet-4-5-20250929"),
+                max_tokens=chat_raw.get("max_tokens", 4096),
+            ),
+            port_range_start=raw.get("port_range_start", 9200),
+            port_range_end=raw.get("port_range_end", 9299),
+            test_command=raw.get("test_command", "pytest"),
+            push_to_remote=raw.get("push_to_remote", True),
+            symlink_files=raw.get("symlink_files", []),
+            copy_files=raw.get("copy_files", ["CLAUDE.md", "PROGRESS.md"]),
+            max_merge_retries=raw.get("max_merge_retries", 3),
+        )
+        _agent_config_cache = (candidate, st.st_mtime_ns, config)
+        return config
     return AgentConfig()
 
 
-AGENT_CONFIG = _load_agent_config(agent_dir.root)
+def get_agent_config() -> AgentConfig:
+    """Current agent config; parsing is memoized by the mtime cache above.
+
+    Kept as an accessor (not an import-time constant) so importing the
+    module for CLI flags like --help doesn't touch the config file.
+    """
+    return _load_agent_config(agent_dir.root)
+
+
+def __getattr__(name: str):
+    # Back-compat for callers/tests that still read module-level
+    # AGENT_CONFIG; resolves lazily on first access.
+    if name == "AGENT_CONFIG":
+        return get_agent_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------------------------------------------------------------------------
 # Task helpers
@@ -168,33 +297,37 @@ STATUSES = ("pending", "plan_review", "in_progress", "completed", "failed")
 
 
 
-def _list_tasks(status: str) -> list[TaskSummary]:
-    """List tasks from dev-tasks.json (single source of truth)."""
-    data = _load_dev_tasks()
+def _list_tasks(status: str) -> list[dict]:
+    """List tasks from dev-tasks.json (single source of truth).
+
+    Returns JSON-ready dicts matching the TaskSummary schema. The read
+    path skips Pydantic model construction entirely — validation happens
+    on write, and consumers (dashboard connectors) validate on their side.
+    """
+    # ISO-8601 timestamps with a consistent offset sort lexicographically
+    # in chronological order, so order on the raw strings up front instead
+    # of comparing datetime objects during the sort.
+    items = [
+        (t.get("modified") or t.get("created", ""), task_id, t)
+        for task_id, t in _tasks_with_status(status)
+    ]
+    items.sort(reverse=True)
     tasks = []
-    for task_id, t in data.get("tasks", {}).items():
-        if t.get("status") != status:
-            continue
+    for modified_str, task_id, t in items:
         task_type = t.get("task_type", "feature")
         if task_type not in TASK_TYPE_VALUES:
             task_type = "feature"
-        modified_str = t.get("modified") or t.get("created", "")
-        try:
-            modified = datetime.fromisoformat(modified_str)
-        except (ValueError, TypeError):
-            modified = datetime.now(timezone.utc)
-        tasks.append(TaskSummary(
-            id=task_id,
-            filename=f"{task_id}.md",
-            status=status,
-            title=t.get("title", task_id),
-            modified=modified,
-            has_error_log=bool(t.get("error")),
-            task_type=task_type,
-            needs_plan_review=t.get("needs_plan_review", False),
-            has_plan=bool(t.get("plan_content")),
-        ))
-    tasks.sort(key=lambda x: x.modified, reverse=True)
+        tasks.append({
+            "id": task_id,
+            "filename": f"{task_id}.md",
+            "status": status,
+            "title": t.get("title", task_id),
+            "modified": modified_str or datetime.now(timezone.utc).isoformat(),
+            "has_error_log": bool(t.get("error")),
+            "task_type": task_type,
+            "needs_plan_review": t.get("needs_plan_review", False),
+            "has_plan": bool(t.get("plan_content")),
+        })
     return tasks
 
 
@@ -204,7 +337,7 @@ def _read_task(status: str, filename: str) -> TaskDetail | None:
     Session logs are stored as separate files in data/ due to their size.
     """
     task_id = filename.replace(".md", "")
-    data = _load_dev_tasks()
+    data = _load_dev_tasks_readonly()
     t = data.get("tasks", {}).get(task_id)
     if t is None or t.get("status") != status:
         return None
@@ -218,16 +351,13 @@ def _read_task(status: str, filename: str) -> TaskDetail | None:
     except (ValueError, TypeError):
         modified = datetime.now(timezone.utc)
 
-    # Session logs are large — stored as files in data/
-    session_log = None
-    log_path = agent_dir.data / f"{task_id}.log.json"
-    if log_path.exists():
-        try:
-            session_log = json.loads(log_path.read_text(encoding="utf-8"))
-            if not isinstance(session_log, list):
-                session_log = [session_log]
-        except (json.JSONDecodeError, OSError):
-            session_log = None
+    # Session logs can be multi-MB — never parsed into the detail payload.
+    # Clients that want the events stream them from the dedicated
+    # /agent/tasks/{task_id}/session-log endpoint.
+    has_session_log = (
+        (agent_dir.data / f"{task_id}.events.ndjson").exists()
+        or (agent_dir.data / f"{task_id}.log.json").exists()
+    )
 
     return TaskDetail(
         id=task_id,
@@ -240,7 +370,7 @@ def _read_task(status: str, filename: str) -> TaskDetail | None:
         needs_plan_review=t.get("needs_plan_review", False),
         plan_content=t.get("plan_content"),
         error_log=t.get("error"),
-        session_log=session_log,
+        has_session_log=has_session_log,
     )
 
 
@@ -268,32 +398,223 @@ def _create_task(
 # Centralized JSON task tracking (data/dev-tasks.json)
 # ---------------------------------------------------------------------------
 
-_dev_tasks_lock = threading.Lock()
+_dev_tasks_lock = threading.RLock()
+
+# Set once the dispatcher is first requested (see _get_dispatcher); lets
+# task-creation helpers wake the dispatch loop without an import cycle.
+_dispatcher: Dispatcher | None = None
+
+# In-memory cache of task state: (path, stat_key, data). The stat key covers
+# both the snapshot and the WAL, so a cold read (files changed on disk, e.g.
+# written through the worktree symlink) reloads transparently while warm
+# reads collapse to two stats + a dict lookup.
+_dev_tasks_cache: tuple[Path, tuple, dict] | None = None
+
+# Secondary index: status -> set of task ids. Rebuilt with the cache and
+# updated incrementally on each mutation so per-status listing is O(k) in
+# the number of matching tasks instead of O(N) over the full history.
+_dev_tasks_status_index: dict[str, set[str]] = {}
+
+# Compact the WAL back into the snapshot once it grows past this size.
+_WAL_COMPACT_BYTES = 64 * 1024
 
 
 def _dev_tasks_path() -> Path:
     return agent_dir.data / "dev-tasks.json"
 
 
-def _load_dev_tasks() -> dict:
-    """Load the dev-tasks.json file, returning empty structure if missing."""
-    path = _dev_tasks_path()
-    if not path.exists():
-        return {"tasks": {}}
+def _dev_tasks_log_path() -> Path:
+    return agent_dir.data / "dev-tasks.log"
+
+
+def _dev_tasks_stat_key(path: Path, log_path: Path) -> tuple | None:
+    """Build the cache invalidation key from snapshot + WAL stats.
+
+    Returns None when neither file exists (nothing to cache).
+    """
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {"tasks": {}}
+        st = path.stat()
+        snap_key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        snap_key = None
+    try:
+        st = log_path.stat()
+        log_key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        log_key = None
+    if snap_key is None and log_key is None:
+        return None
+    return (snap_key, log_key)
+
+
+def _replay_dev_tasks_log(log_path: Path, data: dict) -> None:
+    """Replay the append-only mutation log on top of a snapshot."""
+    try:
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = _json_loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt dev-tasks.log entry")
+                    continue
+                task_id = record.get("id")
+                if task_id:
+                    data["tasks"].setdefault(task_id, {}).update(record.get("fields", {}))
+    except OSError:
+        pass
+
+
+def _build_status_index(data: dict) -> dict[str, set[str]]:
+    """Build the status -> task ids index for a freshly loaded dict."""
+    index: dict[str, set[str]] = {}
+    for task_id, t in data.get("tasks", {}).items():
+        index.setdefault(t.get("status", ""), set()).add(task_id)
+    return index
+
+
+def _load_dev_tasks_readonly() -> dict:
+    """Return the shared cached dict — callers must NOT mutate it.
+
+    Used by pure readers (`_list_tasks`, `_get_pending_tasks`, ...) to skip
+    the defensive copy that `_load_dev_tasks` makes for mutating callers.
+    State is the snapshot (dev-tasks.json) plus the replayed WAL
+    (dev-tasks.log).
+    """
+    global _dev_tasks_cache, _dev_tasks_status_index
+    with _dev_tasks_lock:
+        path = _dev_tasks_path()
+        log_path = _dev_tasks_log_path()
+        key = _dev_tasks_stat_key(path, log_path)
+        if key is None:
+            _dev_tasks_status_index = {}
+            return {"tasks": {}}
+        cache = _dev_tasks_cache
+        if cache is not None and cache[0] == path and cache[1] == key:
+            return cache[2]
+        data = {"tasks": {}}
+        try:
+            loaded = _json_loads(path.read_bytes())
+            if isinstance(loaded, dict):
+                data = loaded
+                data.setdefault("tasks", {})
+        except (json.JSONDecodeError, OSError):
+            pass
+        _replay_dev_tasks_log(log_path, data)
+        _dev_tasks_cache = (path, key, data)
+        _dev_tasks_status_index = _build_status_index(data)
+        return data
+
+
+def _tasks_with_status(status: str) -> list[tuple[str, dict]]:
+    """Return (task_id, task) pairs for one status via the status index."""
+    with _dev_tasks_lock:
+        data = _load_dev_tasks_readonly()
+        tasks = data["tasks"]
+        ids = _dev_tasks_status_index.get(status, ())
+        return [(tid, tasks[tid]) for tid in ids if tid in tasks]
+
+
+def _load_dev_tasks() -> dict:
+    """Load the current task state, returning empty structure if missing.
+
+    Returns a private copy — callers are free to mutate and pass the result
+    to `_save_dev_tasks`. Reads are served from the in-memory cache when the
+    underlying files are unchanged (mtime + size check).
+    """
+    return copy.deepcopy(_load_dev_tasks_readonly())
+
+
+_wal_handle: tuple[Path, object, int] | None = None  # (path, file, size)
+
+
+def _wal_append(line: str) -> int:
+    """Append one line to the WAL through a persistent file handle.
+
+    Keeping the log open across mutations drops the open/close syscall
+    pair per status change, and tracking the size in memory replaces the
+    stat() that decided when to compact. Character count slightly
+    undercounts byte size for non-ASCII content, which only delays
+    compaction by a few lines. Must be called while holding
+    `_dev_tasks_lock`.
+    """
+    global _wal_handle
+    path = _dev_tasks_log_path()
+    if _wal_handle is None or _wal_handle[0] != path:
+        _close_wal_handle()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "a", encoding="utf-8")
+        _wal_handle = (path, f, f.tell())
+    _, f, size = _wal_handle
+    f.write(line)
+    f.flush()
+    size += len(line)
+    _wal_handle = (path, f, size)
+    return size
+
+
+def _close_wal_handle() -> None:
+    global _wal_handle
+    if _wal_handle is not None:
+        try:
+            _wal_handle[1].close()
+        except OSError:
+            pass
+        _wal_handle = None
+
+
+def _append_task_mutation(task_id: str, fields: dict) -> None:
+    """Record a single-task mutation in the WAL and the in-memory cache.
+
+    Appending one JSON line is O(1) per mutation versus rewriting the full
+    snapshot; once the log grows past _WAL_COMPACT_BYTES it is compacted
+    back into dev-tasks.json via `_save_dev_tasks`. Must be called while
+    holding `_dev_tasks_lock`.
+    """
+    global _dev_tasks_cache
+    data = _load_dev_tasks_readonly()
+    task = data["tasks"].setdefault(task_id, {})
+    old_status = task.get("status")
+    task.update(fields)
+    new_status = task.get("status")
+    if new_status != old_status:
+        if old_status is not None:
+            _dev_tasks_status_index.get(old_status, set()).discard(task_id)
+        _dev_tasks_status_index.setdefault(new_status, set()).add(task_id)
+    record = {
+        "op": "update",
+        "id": task_id,
+        "fields": fields,
+        "ts": datetime.now(timezone.utc).isoformat(),
+    }
+    if _wal_append(_json_dumps(record) + "\n") > _WAL_COMPACT_BYTES:
+        _save_dev_tasks(data)  # compact: fresh snapshot + drop the log
+        return
+    key = _dev_tasks_stat_key(_dev_tasks_path(), _dev_tasks_log_path())
+    _dev_tasks_cache = (_dev_tasks_path(), key, data)
 
 
 def _save_dev_tasks(data: dict) -> None:
-    """Write dev-tasks.json atomically (write to temp, then rename)."""
+    """Write a full dev-tasks.json snapshot atomically (temp + rename).
+
+    Also truncates the WAL — the snapshot supersedes it — and refreshes
+    the in-memory cache write-through so the next read is a cache hit.
+    """
+    global _dev_tasks_cache, _dev_tasks_status_index
     path = _dev_tasks_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    # Reuse one stable temp path instead of mkstemp — writers serialize on
+    # _dev_tasks_lock, so there is no name race, and this avoids creating
+    # and unlinking a fresh directory entry on every snapshot.
+    tmp_path = str(path) + ".tmp"
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp_path, "wb") as f:
+            # Snapshot stays pretty-printed — it is the file humans inspect.
+            f.write(_json_dumps_pretty(data))
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp_path, str(path))
     except BaseException:
         try:
@@ -301,16 +622,29 @@ def _save_dev_tasks(data: dict) -> None:
         except OSError:
             pass
         raise
+    with _dev_tasks_lock:
+        log_path = _dev_tasks_log_path()
+        _close_wal_handle()
+        # Truncate in place rather than unlink: worktrees symlink the WAL
+        # (see agent.yaml symlink_files), and unlinking would leave their
+        # links pointing at a dead inode until the next append.
+        try:
+            with open(log_path, "w", encoding="utf-8"):
+                pass
+        except OSError:
+            pass
+        key = _dev_tasks_stat_key(path, log_path)
+        _dev_tasks_cache = (path, key, data) if key is not None else None
+        _dev_tasks_status_index = _build_status_index(data)
 
 
 def _add_task_to_json(
     task_id: str, title: str, content: str, task_type: str, needs_plan_review: bool = False,
 ) -> None:
-    """Add a new task entry to dev-tasks.json."""
+    """Add a new task entry to the task store."""
     now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        data["tasks"][task_id] = {
+        _append_task_mutation(task_id, {
             "id": task_id,
             "title": title,
             "content": content,
@@ -322,78 +656,79 @@ def _add_task_to_json(
             "error": None,
             "needs_plan_review": needs_plan_review,
             "plan_content": None,
-        }
-        _save_dev_tasks(data)
+        })
+    _notify_dispatcher()
+
+
+def _notify_dispatcher() -> None:
+    """Wake the dispatcher so a freshly created task is picked up promptly."""
+    dispatcher = _dispatcher
+    if dispatcher is not None:
+        dispatcher._wakeup.set()
 
 
 def _claim_task_json(task_id: str, port: int | None = None) -> dict | None:
-    """Atomically claim a task by setting it to in_progress in JSON."""
+    """Atomically claim a task by setting it to in_progress."""
     now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
+        data = _load_dev_tasks_readonly()
         task = data["tasks"].get(task_id)
         if task is None or task["status"] != "pending":
             return None
-        task["status"] = "in_progress"
-        task["modified"] = now
-        task["worker_port"] = port
-        _save_dev_tasks(data)
-        return task
+        _append_task_mutation(task_id, {
+            "status": "in_progress",
+            "modified": now,
+            "worker_port": port,
+        })
+        return copy.deepcopy(task)
 
 
 def _mark_task_complete_json(task_id: str) -> None:
-    """Mark a task as completed in dev-tasks.json."""
+    """Mark a task as completed."""
     now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            task["status"] = "completed"
-            task["modified"] = now
-            task["worker_port"] = None
-            _save_dev_tasks(data)
+        if task_id in _load_dev_tasks_readonly()["tasks"]:
+            _append_task_mutation(task_id, {
+                "status": "completed",
+                "modified": now,
+                "worker_port": None,
+            })
 
 
 def _mark_task_failed_json(task_id: str, error: str) -> None:
-    """Mark a task as failed in dev-tasks.json."""
+    """Mark a task as failed."""
     now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            task["status"] = "failed"
-            task["modified"] = now
-            task["worker_port"] = None
-            task["error"] = error
-            _save_dev_tasks(data)
+        if task_id in _load_dev_tasks_readonly()["tasks"]:
+            _append_task_mutation(task_id, {
+                "status": "failed",
+                "modified": now,
+                "worker_port": None,
+                "error": error,
+            })
 
 
 def _mark_task_plan_review_json(task_id: str, plan_content: str | None = None) -> None:
-    """Mark a task as plan_review in dev-tasks.json, storing the plan content."""
+    """Mark a task as plan_review, storing the plan content."""
     now = datetime.now(timezone.utc).isoformat()
+    fields = {"status": "plan_review", "modified": now, "worker_port": None}
+    if plan_content is not None:
+        fields["plan_content"] = plan_content
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            task["status"] = "plan_review"
-            task["modified"] = now
-            task["worker_port"] = None
-            if plan_content is not None:
-                task["plan_content"] = plan_content
-            _save_dev_tasks(data)
+        if task_id in _load_dev_tasks_readonly()["tasks"]:
+            _append_task_mutation(task_id, fields)
 
 
 def _mark_task_pending_json(task_id: str) -> None:
-    """Mark a task as pending in dev-tasks.json (used after plan approve/revise)."""
+    """Mark a task as pending (used after plan approve/revise)."""
     now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            task["status"] = "pending"
-            task["modified"] = now
-            task["worker_port"] = None
-            _save_dev_tasks(data)
+        if task_id in _load_dev_tasks_readonly()["tasks"]:
+            _append_task_mutation(task_id, {
+                "status": "pending",
+                "modified": now,
+                "worker_port": None,
+            })
 
 
 
@@ -402,96 +737,227 @@ def _mark_task_pending_json(task_id: str) -> None:
 # ---------------------------------------------------------------------------
 
 class PortAllocator:
-    """Allocates unique ports for task workers from a configured range."""
+    """Allocates unique ports for task workers from a configured range.
+
+    Free ports live in a deque so allocate/release are O(1) — no
+    set-difference scan of the whole range under the lock.
+    """
 
     def __init__(self, start: int, end: int):
-        self._range = set(range(start, end + 1))
+        self._free: deque[int] = deque(range(start, end + 1))
         self._in_use: set[int] = set()
         self._lock = threading.Lock()
 
     def allocate(self) -> int:
         with self._lock:
-            available = self._range - self._in_use
-            if not available:
-                raise RuntimeError("No ports available")
-            port = min(available)
+            try:
+                port = self._free.popleft()
+            except IndexError:
+                raise RuntimeError("No ports available") from None
             self._in_use.add(port)
             return port
 
     def release(self, port: int) -> None:
         with self._lock:
-            self._in_use.discard(port)
+            if port in self._in_use:
+                self._in_use.discard(port)
+                self._free.append(port)
 
 
 # ---------------------------------------------------------------------------
 # Git helpers
 # ---------------------------------------------------------------------------
 
+def _worktree_from_attrs(attrs: dict[str, str]) -> WorktreeInfo:
+    return WorktreeInfo(
+        path=attrs.get("worktree", ""),
+        branch=attrs.get("branch", "").replace("refs/heads/", ""),
+        commit=attrs.get("HEAD", ""),
+        is_bare="bare" in attrs,
+    )
+
+
+# Dashboard polling hits the worktree/commit endpoints continuously; a
+# short TTL keeps each fork+exec of git down to at most once per second
+# regardless of poll frequency.
+_GIT_CACHE_TTL = 1.0
+_worktrees_cache: tuple[float, list[WorktreeInfo]] | None = None
+_commits_cache: tuple[float, int, list[GitLogEntry]] | None = None
+
+
+def _git_read_env() -> dict[str, str]:
+    """Environment for read-only git commands.
+
+    GIT_OPTIONAL_LOCKS=0 tells git to skip optional lock files (e.g. the
+    index lock taken by background maintenance of `git status`-like
+    commands), so dashboard reads never contend with worker merges.
+    """
+    return {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
+# libgit2 repository handle, opened once per project root. Any failure on
+# the in-process path falls back to the subprocess implementations below.
+_pygit2_repo_cache: tuple[Path, object] | None = None
+
+
+def _pygit2_repo():
+    global _pygit2_repo_cache
+    if pygit2 is None:
+        return None
+    root = agent_dir.root
+    cache = _pygit2_repo_cache
+    if cache is not None and cache[0] == root:
+        return cache[1]
+    try:
+        repo = pygit2.Repository(str(root))
+    except Exception:
+        return None
+    _pygit2_repo_cache = (root, repo)
+    return repo
+
+
+def _worktrees_from_pygit2(repo) -> list[WorktreeInfo]:
+    def _head_info(r) -> tuple[str, str]:
+        try:
+            return r.head.shorthand, str(r.head.target)
+        except Exception:  # unborn or detached-invalid HEAD
+            return "", ""
+
+    branch, commit = _head_info(repo)
+    worktrees = [WorktreeInfo(
+        path=(repo.workdir or repo.path).rstrip("/"),
+        branch=branch,
+        commit=commit,
+        is_bare=repo.is_bare,
+    )]
+    for name in repo.list_worktrees():
+        wt = repo.lookup_worktree(name)
+        wt_repo = pygit2.Repository(wt.path)
+        branch, commit = _head_info(wt_repo)
+        worktrees.append(WorktreeInfo(
+            path=wt.path.rstrip("/"), branch=branch, commit=commit, is_bare=False,
+        ))
+    return worktrees
+
+
 def _get_worktrees() -> list[WorktreeInfo]:
+    global _worktrees_cache
+    if _worktrees_cache is not None and time.monotonic() - _worktrees_cache[0] < _GIT_CACHE_TTL:
+        return _worktrees_cache[1]
+    repo = _pygit2_repo()
+    if repo is not None:
+        try:
+            worktrees = _worktrees_from_pygit2(repo)
+        except Exception:
+            logger.debug("pygit2 worktree listing failed, using subprocess", exc_info=True)
+        else:
+            _worktrees_cache = (time.monotonic(), worktrees)
+            return worktrees
+    # -z output: attribute lines are NUL-terminated and records end with an
+    # extra NUL, so parsing is two bytes.split calls plus one partition per
+    # attribute — no per-line startswith cascade or blank-line ambiguity.
     try:
         result = subprocess.run(
-            ["git", "worktree", "list", "--porcelain"],
-            cwd=agent_dir.root, capture_output=True, text=True, timeout=10,
+            ["git", "worktree", "list", "--porcelain", "-z"],
+            cwd=agent_dir.root, capture_output=True, timeout=10,
+            env=_git_read_env(),
         )
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return []
     if result.returncode != 0:
         return []
     worktrees: list[WorktreeInfo] = []
-    current: dict[str, str] = {}
-    for line in result.stdout.splitlines():
-        if not line.strip():
-            if current:
-                worktrees.append(WorktreeInfo(
-                    path=current.get("worktree", ""),
-                    branch=current.get("branch", "").replace("refs/heads/", ""),
-                    commit=current.get("HEAD", ""),
-                    is_bare=current.get("bare", "") == "bare",
-                ))
-                current = {}
+    for record in result.stdout.split(b"\x00\x00"):
+        attrs: dict[str, str] = {}
+        for line in record.split(b"\x00"):
+            if not line:
+                continue
+            label, _, value = line.decode(errors="replace").partition(" ")
+            attrs[label] = value
+        if attrs:
+            worktrees.append(_worktree_from_attrs(attrs))
+    _worktrees_cache = (time.monotonic(), worktrees)
+    return worktrees
+
+
+_GIT_LOG_FORMAT = "%H%x00%s%x00%an%x00%ci%x00%D"
+_GIT_LOG_FIELDS = 5
+
+
+def _commits_from_pygit2(repo, count: int) -> list[GitLogEntry]:
+    try:
+        target = repo.head.target
+    except Exception:  # unborn HEAD — no commits yet
+        return []
+    # Decorations (the %D field): refs grouped by the commit they point at.
+    decorations: dict[str, list[str]] = {}
+    for name in repo.references:
+        ref = repo.references[name]
+        try:
+            sha = str(ref.resolve().target)
+        except Exception:
             continue
-        if line.startswith("worktree "):
-            current["worktree"] = line[len("worktree "):]
-        elif line.startswith("HEAD "):
-            current["HEAD"] = line[len("HEAD "):]
-        elif line.startswith("branch "):
-            current["branch"] = line[len("branch "):]
-        elif line == "bare":
-            current["bare"] = "bare"
-    if current:
-        worktrees.append(WorktreeInfo(
-            path=current.get("worktree", ""),
-            branch=current.get("branch", "").replace("refs/heads/", ""),
-            commit=current.get("HEAD", ""),
-            is_bare=current.get("bare", "") == "bare",
+        decorations.setdefault(sha, []).append(ref.shorthand)
+    entries = []
+    for commit in repo.walk(target, pygit2.GIT_SORT_TIME):
+        sha = str(commit.id)
+        tz = timezone(timedelta(minutes=commit.commit_time_offset))
+        date = datetime.fromtimestamp(commit.commit_time, tz)
+        entries.append(GitLogEntry(
+            sha=sha,
+            message=commit.message.split("\n", 1)[0],
+            author=commit.author.name,
+            date=date.strftime("%Y-%m-%d %H:%M:%S %z"),
+            branch=", ".join(decorations.get(sha, [])),
         ))
-    return worktrees
+        if len(entries) >= count:
+            break
+    return entries
 
 
 def _get_recent_commits(count: int = 10) -> list[GitLogEntry]:
-    sep = "---BATON-SEP---"
-    fmt = f"%H{sep}%s{sep}%an{sep}%ci{sep}%D"
+    global _commits_cache
+    if (
+        _commits_cache is not None
+        and _commits_cache[1] == count
+        and time.monotonic() - _commits_cache[0] < _GIT_CACHE_TTL
+    ):
+        return _commits_cache[2]
+    repo = _pygit2_repo()
+    if repo is not None:
+        try:
+            entries = _commits_from_pygit2(repo, count)
+        except Exception:
+            logger.debug("pygit2 commit walk failed, using subprocess", exc_info=True)
+        else:
+            _commits_cache = (time.monotonic(), count, entries)
+            return entries
+    # NUL-delimited fields and records (-z): immune to commit-message
+    # contents and parsed with a single bytes.split instead of a sentinel
+    # string split per line.
     try:
         result = subprocess.run(
-            ["git", "log", f"--max-count={count}", f"--format={fmt}"],
-            cwd=agent_dir.root, capture_output=True, text=True, timeout=10,
+            ["git", "log", "-z", f"--max-count={count}", f"--format={_GIT_LOG_FORMAT}"],
+            cwd=agent_dir.root, capture_output=True, timeout=10,
+            env=_git_read_env(),
         )
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return []
     if result.returncode != 0:
         return []
+    # Flat field list: 5 fields per commit, trailing empty chunk from the
+    # final NUL record terminator.
+    fields = result.stdout.split(b"\x00")
     entries = []
-    for line in result.stdout.strip().splitlines():
-        parts = line.split(sep)
-        if len(parts) < 4:
-            continue
+    for i in range(0, len(fields) - (_GIT_LOG_FIELDS - 1), _GIT_LOG_FIELDS):
         entries.append(GitLogEntry(
-            sha=parts[0],
-            message=parts[1],
-            author=parts[2],
-            date=parts[3],
-            branch=parts[4] if len(parts) > 4 else "",
+            sha=fields[i].decode(errors="replace"),
+            message=fields[i + 1].decode(errors="replace"),
+            author=fields[i + 2].decode(errors="replace"),
+            date=fields[i + 3].decode(errors="replace"),
+            branch=fields[i + 4].decode(errors="replace"),
         ))
+    _commits_cache = (time.monotonic(), count, entries)
     return entries
 
 # ---------------------------------------------------------------------------
@@ -511,69 +977,318 @@ def _build_cc_command(prompt: str, cc_config: ClaudeCodeConfig) -> list[str]:
 # Log monitor
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class TaskLog:
+    """Running counters for one Claude Code session.
+
+    Events are streamed straight to the NDJSON sidecar as they arrive, so
+    only counts (for the summary) and extracted plan text are kept in
+    memory — a long session no longer grows the process by thousands of
+    buffered event dicts. Slots plus a lazily created plan list keep the
+    per-task footprint minimal across dispatcher churn.
+    """
+
     task_id: str
-    events: list = field(default_factory=list)
-    errors: list = field(default_factory=list)
-    tool_uses: list = field(default_factory=list)
-    assistant_messages: list = field(default_factory=list)
+    event_count: int = 0
+    error_count: int = 0
+    tool_use_count: int = 0
+    message_count: int = 0
+    plan_parts: list[str] | None = None
+    _events_fd: int | None = field(default=None, repr=False)
 
     @property
     def has_errors(self) -> bool:
-        return len(self.errors) > 0
+        return self.error_count > 0
 
     @property
     def summary(self) -> dict:
         return {
             "task_id": self.task_id,
-            "total_events": len(self.events),
-            "errors": len(self.errors),
-            "tool_uses": len(self.tool_uses),
-            "messages": len(self.assistant_messages),
+            "total_events": self.event_count,
+            "errors": self.error_count,
+            "tool_uses": self.tool_use_count,
+            "messages": self.message_count,
         }
 
+    def open_events_file(self, data_dir: Path) -> None:
+        """Open the NDJSON sidecar that events are streamed into.
+
+        One event per line as it arrives — avoids buffering and
+        re-serializing the entire session at the end of the task.
+        """
+        _ensure_dir(data_dir)
+        self._events_fd = os.open(
+            data_dir / f"{self.task_id}.events.ndjson",
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND,
+            0o644,
+        )
+
+    def write_event(self, event: dict) -> None:
+        fd = self._events_fd
+        if fd is not None:
+            try:
+                # Unbuffered single-syscall append: each event is durable in
+                # the page cache immediately, so live session-log reads see
+                # it without waiting for a buffer flush at task end.
+                os.write(fd, _json_dumps_bytes(event) + b"\n")
+            except OSError:  # closed during shutdown
+                pass
+
+    def close_events_file(self) -> None:
+        if self._events_fd is not None:
+            try:
+                os.close(self._events_fd)
+            except OSError:
+                pass
+            self._events_fd = None
+
+    def add_plan_part(self, text: str) -> None:
+        if self.plan_parts is None:
+            self.plan_parts = []
+        self.plan_parts.append(text)
+
 
 def _parse_log_event(event: dict, task_log: TaskLog):
-    task_log.events.append(event)
+    task_log.event_count += 1
+    task_log.write_event(event)
     event_type = event.get("type", "")
+    # The pump thread has no task context — tag records with the task id so
+    # TaskLogRouter can still route them to the task's log file.
+    log_extra = {"task_id": task_log.task_id}
     if event_type == "error":
-        task_log.errors.append(event)
-        logger.error(f"[{task_log.task_id}] Error: {event.get('error', {})}")
+        task_log.error_count += 1
+        logger.error(f"[{task_log.task_id}] Error: {event.get('error', {})}", extra=log_extra)
     elif event_type == "assistant":
-        task_log.assistant_messages.append(event.get("message", ""))
+        task_log.message_count += 1
+        # Collect text content as it arrives so plan extraction does not
+        # need the full event history.
+        msg = event.get("message", "")
+        if isinstance(msg, str) and msg.strip():
+            task_log.add_plan_part(msg)
+        elif isinstance(msg, dict):
+            for block in msg.get("content", []):
+                if isinstance(block, dict) and block.get("type") == "text":
+                    task_log.add_plan_part(block["text"])
     elif event_type == "tool_use":
-        tool_name = event.get("tool", "")
-        task_log.tool_uses.append({"tool": tool_name, "input": event.get("input", {})})
+        task_log.tool_use_count += 1
     elif event_type == "result":
-        logger.info(f"[{task_log.task_id}] Result: cost=${event.get('cost_usd', 0):.4f}")
+        result_text = event.get("result", "")
+        if isinstance(result_text, str) and result_text.strip():
+            task_log.add_plan_part(result_text)
+        logger.info(
+            f"[{task_log.task_id}] Result: cost=${event.get('cost_usd', 0):.4f}",
+            extra=log_extra,
+        )
+
+
+def _stream_session_log(task_id: str):
+    """Return an iterator over the session log as a JSON array, or None.
+
+    The NDJSON sidecar is streamed event by event so responses start
+    immediately and memory stays constant regardless of log size. Legacy
+    .log.json files yield the same contract — a bare event array — by
+    extracting their "events" field; they predate the sidecar and are
+    bounded in size, so loading one is fine.
+    """
+    events_path = agent_dir.data / f"{task_id}.events.ndjson"
+    if events_path.exists():
+        def generate():
+            yield "["
+            first = True
+            with open(events_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    yield line if first else "," + line
+                    first = False
+            yield "]"
+        return generate()
+
+    log_path = agent_dir.data / f"{task_id}.log.json"
+    if log_path.exists():
+        def generate_legacy():
+            try:
+                log = _json_loads(log_path.read_bytes())
+            except (json.JSONDecodeError, OSError):
+                yield "[]"
+                return
+            events = log.get("events", []) if isinstance(log, dict) else log
+            yield _json_dumps(events)
+        return generate_legacy()
+
+    return None
 
 
 def _save_task_log(task_log: TaskLog):
-    """Save session log to data/ directory."""
+    """Save the session summary to data/ directory.
+
+    Events are already on disk in the NDJSON sidecar (streamed during the
+    run), so only the small summary is written here.
+    """
     data_dir = agent_dir.data
-    data_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(data_dir)
     log_file = data_dir / f"{task_log.task_id}.log.json"
-    with open(log_file, "w") as f:
-        json.dump({"summary": task_log.summary, "events": task_log.events},
-                  f, indent=2, ensure_ascii=False)
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(_json_dumps({"summary": task_log.summary}))
+
+
+# ---------------------------------------------------------------------------
+# Event pump — one reader thread for all Claude Code stdout streams
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _PumpEntry:
+    task_log: TaskLog
+    done: threading.Event
+    buffer: bytes = b""
+
+
+class _EventPump:
+    """Drains every active Claude Code stdout through one selector thread.
+
+    Worker threads previously parked on a blocking `for line in
+    proc.stdout` loop for the lifetime of each subprocess, so each running
+    task pinned a thread to IO. The pump multiplexes all streams with
+    non-blocking reads, feeds parsed events to each task's TaskLog, and
+    workers simply wait on a per-task done Event.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # Self-pipe so register() can interrupt a parked select().
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def register(self, proc: subprocess.Popen, task_log: TaskLog) -> threading.Event:
+        """Start draining proc.stdout; returns an Event set at stream EOF."""
+        fd = proc.stdout.fileno()
+        os.set_blocking(fd, False)
+        entry = _PumpEntry(task_log=task_log, done=threading.Event())
+        with self._lock:
+            self._selector.register(fd, selectors.EVENT_READ, entry)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="event-pump",
+                )
+                self._thread.start()
+        os.write(self._wake_w, b"\0")
+        return entry.done
+
+    def _run(self):
+        while True:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                self._drain(key.fd, key.data)
+
+    def _drain(self, fd: int, entry: _PumpEntry):
+        try:
+            chunk = os.read(fd, 1 << 16)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if chunk:
+            # Common case: the previous chunk ended on a line boundary, so
+            # skip the buffer concatenation entirely.
+            data = entry.buffer + chunk if entry.buffer else chunk
+            *lines, entry.buffer = data.split(b"\n")
+            for line in lines:
+                self._feed(line, entry.task_log)
+            return
+        # EOF — flush a partial trailing line, then signal completion
+        if entry.buffer:
+            self._feed(entry.buffer, entry.task_log)
+            entry.buffer = b""
+        with self._lock:
+            try:
+                self._selector.unregister(fd)
+            except KeyError:
+                pass
+        entry.done.set()
+
+    @staticmethod
+    def _feed(line: bytes, task_log: TaskLog):
+        # Every stream-json event is an object, so anything not starting
+        # with "{" (verbose progress noise, blank lines) is skipped with a
+        # byte compare instead of raising through the decoder.
+        if line.lstrip()[:1] != b"{":
+            return
+        try:
+            event = _json_loads(line)
+        except json.JSONDecodeError:
+            return
+        try:
+            _parse_log_event(event, task_log)
+        except Exception:
+            logger.exception(f"[{task_log.task_id}] Failed to handle stream event")
 
 
 # ---------------------------------------------------------------------------
 # Dispatcher — runs as a background thread inside the agent
 # ---------------------------------------------------------------------------
 
+@dataclass(slots=True)
+class _PushRequest:
+    """A waiter for the coalescing push worker."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    error: str | None = None
+
+
+_FETCH_TTL = 2.0  # seconds a fetch stays fresh for all workers
+
+
 class Dispatcher:
     def __init__(self, config: AgentConfig):
         self.config = config
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
         self._active_tasks: dict[str, any] = {}
+        # Guarded by the GIL: workers only do single-key set/pop (atomic on
+        # CPython dicts) and shutdown snapshots with list(items()).
         self._active_procs: dict[str, subprocess.Popen] = {}
-        self._procs_lock = threading.Lock()
         self._executor: ThreadPoolExecutor | None = None
-        self._git_lock = threading.Lock()
+        # Root-repo writer lock: serializes operations that move root's HEAD
+        # or shared refs (checkout main, merge to main, push, worktree
+        # add/remove). Per-worktree locks cover operations scoped to one
+        # task's worktree (fetch, merge origin/main, rebase), which can then
+        # run in parallel across workers.
+        self._root_lock = threading.Lock()
+        self._worktree_locks: dict[str, threading.Lock] = {}
+        self._worktree_locks_mutex = threading.Lock()
+        # Coalescing push queue: tasks finishing close together share one
+        # `git push` instead of each paying a network round-trip in turn.
+        self._push_queue: queue.SimpleQueue[_PushRequest] = queue.SimpleQueue()
+        self._push_thread: threading.Thread | None = None
+        self._push_thread_lock = threading.Lock()
+        # Worktree teardown runs off the worker's critical path — workers
+        # enqueue the task id and a reaper thread does the git calls.
+        self._cleanup_queue: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._reaper_thread: threading.Thread | None = None
+        self._reaper_thread_lock = threading.Lock()
+        # Workers share one fetch generation — worktrees use the same
+        # object/ref store, so one worker's fetch serves them all.
+        self._last_fetch_ts = 0.0
+        self._fetch_lock = threading.Lock()
+        # Parsed path fragments for worktree setup (see _setup_paths)
+        self._setup_paths_cache: tuple[tuple, tuple] | None = None
+        # Self-pipe written by stop() so pidfd-based child waits wake
+        # instantly instead of sleeping out their timeout.
+        self._stop_pipe_r, self._stop_pipe_w = os.pipe()
+        os.set_blocking(self._stop_pipe_r, False)
         self._port_allocator = PortAllocator(config.port_range_start, config.port_range_end)
+        self._base_env = dict(os.environ)
+        self._event_pump = _EventPump()
 
     @property
     def status(self) -> str:
@@ -585,6 +1300,15 @@ class Dispatcher:
         if self._thread is not None and self._thread.is_alive():
             return DispatcherStatus(status="running")
         self._stop_event.clear()
+        # Drain any stop signal left in the self-pipe from a previous stop().
+        try:
+            while os.read(self._stop_pipe_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        # Refresh the launch-env snapshot once per start instead of copying
+        # os.environ for every task spawn.
+        self._base_env = dict(os.environ)
         self._executor = ThreadPoolExecutor(max_workers=self.config.max_parallel_workers)
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
@@ -595,6 +1319,11 @@ class Dispatcher:
         if self._thread is None or not self._thread.is_alive():
             return DispatcherStatus(status="stopped")
         self._stop_event.set()
+        self._wakeup.set()  # unblock the poll wait
+        try:
+            os.write(self._stop_pipe_w, b"\0")  # unblock pidfd waits
+        except OSError:
+            pass
         # Terminate all active child processes so blocking stdout reads unblock
         self._terminate_child_processes()
         if self._executor:
@@ -611,13 +1340,9 @@ class Dispatcher:
         Processes are started in their own session (start_new_session=True)
         so we send SIGTERM to the entire process group to ensure all
         grandchild processes are also cleaned up.
-
-        The procs lock is released before waiting on each process to avoid
-        blocking task threads that need the lock to clean up.
         """
-        # Snapshot under lock, then release so task threads can untrack
-        with self._procs_lock:
-            procs = list(self._active_procs.items())
+        # Atomic snapshot — task threads keep set/pop-ing concurrently
+        procs = list(self._active_procs.items())
 
         for task_id, proc in procs:
             try:
@@ -651,39 +1376,67 @@ class Dispatcher:
     def _run_loop(self):
         logger.info(f"Dispatch loop running (project={agent_dir.root})")
         while not self._stop_event.is_set():
-            # Clean up completed futures
-            done = [tid for tid, f in self._active_tasks.items() if f.done()]
-            for tid in done:
-                future = self._active_tasks.pop(tid)
-                exc = future.exception()
-                if exc:
-                    logger.error(f"Task {tid} raised exception: {exc}")
-
-            # Fill with new tasks
-            available_slots = self.config.max_parallel_workers - len(self._active_tasks)
+            self._wakeup.clear()
+            # Fill with new tasks, scaling in-flight work with the backlog:
+            # a handful of pending tasks doesn't need the full worker pool
+            # (each worker spawns a Claude Code instance), while a deep
+            # backlog ramps up to the configured cap.
+            pending = self._get_pending_tasks()
+            target = self._target_concurrency(len(pending))
+            available_slots = target - len(self._active_tasks)
             if available_slots > 0:
-                pending = self._get_pending_tasks()[:available_slots]
-                for task_id in pending:
+                for task_id in pending[:available_slots]:
                     if task_id not in self._active_tasks:
                         future = self._executor.submit(self._execute_task, task_id)
                         self._active_tasks[task_id] = future
+                        future.add_done_callback(
+                            lambda f, tid=task_id: self._on_task_done(tid, f)
+                        )
 
-            self._stop_event.wait(timeout=self.config.poll_interval_seconds)
+            # Sleep until the poll interval elapses or a task creation,
+            # completion, or shutdown wakes us early.
+            self._wakeup.wait(timeout=self.config.poll_interval_seconds)
+
+    def _on_task_done(self, task_id: str, future) -> None:
+        """Free the slot the moment a task future completes.
+
+        Runs on the executor thread; dict.pop is GIL-atomic so no lock is
+        needed, and the wakeup lets the loop refill immediately instead of
+        waiting out the poll interval.
+        """
+        self._active_tasks.pop(task_id, None)
+        exc = future.exception()
+        if exc:
+            logger.error(f"Task {task_id} raised exception: {exc}")
+        self._wakeup.set()
+
+    def _target_concurrency(self, pending_count: int) -> int:
+        """Concurrency target for the current backlog.
+
+        Ramps up one worker per five pending tasks, bounded by twice the
+        CPU count and the configured worker cap, with at least one worker
+        whenever anything is pending.
+        """
+        if pending_count <= 0:
+            return len(self._active_tasks)
+        return max(1, min(
+            -(-pending_count // 5),  # ceil(pending / 5)
+            (os.cpu_count() or 1) * 2,
+            self.config.max_parallel_workers,
+        ))
 
     def _get_pending_tasks(self) -> list[str]:
-        """Return list of pending task IDs from dev-tasks.json."""
-        data = _load_dev_tasks()
-        pending = []
-        for task_id, t in data.get("tasks", {}).items():
-            if t.get("status") == "pending":
-                created = t.get("created", "")
-                pending.append((task_id, created))
-        pending.sort(key=lambda x: x[1])
-        return [tid for tid, _ in pending]
+        """Return list of pending task IDs, oldest first."""
+        pending = [
+            (t.get("created", ""), task_id)
+            for task_id, t in _tasks_with_status("pending")
+        ]
+        pending.sort()
+        return [tid for _, tid in pending]
 
     def _execute_task(self, task_id: str):
         """Route task to plan phase or full execution based on JSON state."""
-        data = _load_dev_tasks()
+        data = _load_dev_tasks_readonly()
         t = data.get("tasks", {}).get(task_id, {})
         needs_plan = t.get("needs_plan_review", False)
         has_plan = bool(t.get("plan_content"))
@@ -697,18 +1450,25 @@ class Dispatcher:
 
         All state is tracked in dev-tasks.json (single source of truth).
         """
-        task_handler = create_task_handler(task_id, project_dir=agent_dir.root)
-        logging.getLogger().addHandler(task_handler)
+        log_token = begin_task_logging(task_id, project_dir=agent_dir.root)
         logger.info(f"Planning task: {task_id}")
         task_log = TaskLog(task_id=task_id)
+        claimed = False
 
         try:
-            # Claim task in JSON
-            _claim_task_json(task_id)
-
-            # Read task content from JSON
-            data = _load_dev_tasks()
-            t = data.get("tasks", {}).get(task_id, {})
+            # Claim task in JSON — the returned record doubles as the
+            # task read, so the lock is taken and the state loaded once.
+            t = _claim_task_json(task_id)
+            if t is None:
+                # Already claimed by another worker (or no longer pending);
+                # proceeding would run CC on an empty prompt and clobber
+                # the legitimate owner's state.
+                logger.info(f"Task claim lost, skipping plan phase: {task_id}")
+                return
+            claimed = True
+            # Only the claim holder may touch the log sidecars — opening
+            # the events file truncates it.
+            task_log.open_events_file(agent_dir.data)
             task_content = t.get("content", "")
 
             prompt = (
@@ -724,19 +1484,15 @@ class Dispatcher:
                 start_new_session=True,
             )
 
-            with self._procs_lock:
-                self._active_procs[task_id] = proc
+            self._active_procs[task_id] = proc
 
-            for line in proc.stdout:
-                if self._stop_event.is_set():
-                    break
-                try:
-                    event = json.loads(line.decode().strip())
-                    _parse_log_event(event, task_log)
-                except json.JSONDecodeError:
-                    pass
+            # Hand the stream to the shared event pump instead of parking
+            # this worker thread on a blocking read loop. The done event
+            # fires at stdout EOF (process exit or termination on stop).
+            events_done = self._event_pump.register(proc, task_log)
+            events_done.wait(timeout=self.config.claude_code.timeout)
 
-            proc.wait(timeout=self.config.claude_code.timeout)
+            self._wait_for_process(proc, timeout=self.config.claude_code.timeout)
 
             if self._stop_event.is_set():
                 raise Exception("Dispatcher stopped — task aborted")
@@ -744,23 +1500,12 @@ class Dispatcher:
             if proc.returncode != 0:
                 raise Exception(f"Claude Code plan phase exit code: {proc.returncode}")
 
-            # Extract plan text from assistant content blocks and result
-            plan_parts = []
-            for event in task_log.events:
-                if event.get("type") == "assistant":
-                    msg = event.get("message", "")
-                    if isinstance(msg, str) and msg.strip():
-                        plan_parts.append(msg)
-                    elif isinstance(msg, dict):
-                        for block in msg.get("content", []):
-                            if isinstance(block, dict) and block.get("type") == "text":
-                                plan_parts.append(block["text"])
-                elif event.get("type") == "result":
-                    result_text = event.get("result", "")
-                    if isinstance(result_text, str) and result_text.strip():
-                        plan_parts.append(result_text)
-
-            plan_text = "\n\n".join(plan_parts) if plan_parts else "No plan generated."
+            # Plan text was collected from assistant content blocks and the
+            # result event as they streamed in.
+            if task_log.plan_parts:
+                plan_text = "\n\n".join(task_log.plan_parts)
+            else:
+                plan_text = "No plan generated."
 
             # Store plan content in JSON and move to plan_review
             _mark_task_plan_review_json(task_id, plan_content=plan_text)
@@ -771,31 +1516,39 @@ class Dispatcher:
             _mark_task_failed_json(task_id, str(e))
 
         finally:
-            with self._procs_lock:
-                self._active_procs.pop(task_id, None)
-            _save_task_log(task_log)
-            logging.getLogger().removeHandler(task_handler)
-            task_handler.close()
+            self._active_procs.pop(task_id, None)
+            task_log.close_events_file()
+            if claimed:
+                _save_task_log(task_log)
+            end_task_logging(task_id, log_token)
 
     def _execute_full(self, task_id: str):
         """Full task execution — worktree, CC, merge+test+push, cleanup.
 
         All state is tracked in dev-tasks.json (single source of truth).
         """
-        task_handler = create_task_handler(task_id, project_dir=agent_dir.root)
-        logging.getLogger().addHandler(task_handler)
+        log_token = begin_task_logging(task_id, project_dir=agent_dir.root)
         logger.info(f"Executing task: {task_id}")
 
         port = self._port_allocator.allocate()
         task_log = TaskLog(task_id=task_id)
+        claimed = False
 
         try:
-            # Step 1: Claim task (atomic JSON update)
-            _claim_task_json(task_id, port)
-
-            # Read task content from JSON
-            data = _load_dev_tasks()
-            t = data.get("tasks", {}).get(task_id, {})
+            # Step 1: Claim task (atomic JSON update) — the returned record
+            # doubles as the task read, so the lock is taken and the state
+            # loaded once.
+            t = _claim_task_json(task_id, port)
+            if t is None:
+                # Already claimed by another worker (or no longer pending);
+                # proceeding would run CC on an empty prompt and clobber
+                # the legitimate owner's state.
+                logger.info(f"Task claim lost, skipping execution: {task_id}")
+                return
+            claimed = True
+            # Only the claim holder may touch the log sidecars — opening
+            # the events file truncates it.
+            task_log.open_events_file(agent_dir.data)
             task_content = t.get("content", "")
             task_title = t.get("title", "")
             plan_content = t.get("plan_content")
@@ -822,8 +1575,7 @@ class Dispatcher:
             )
 
             cmd = _build_cc_command(prompt, self.config.claude_code)
-            env = os.environ.copy()
-            env["TASK_PORT"] = str(port)
+            env = {**self._base_env, "TASK_PORT": str(port)}
             proc = subprocess.Popen(
                 cmd, cwd=str(worktree_path),
                 stdout=subprocess.PIPE, stderr=subprocess.PIPE,
@@ -831,19 +1583,15 @@ class Dispatcher:
                 env=env,
             )
 
-            with self._procs_lock:
-                self._active_procs[task_id] = proc
+            self._active_procs[task_id] = proc
 
-            for line in proc.stdout:
-                if self._stop_event.is_set():
-                    break
-                try:
-                    event = json.loads(line.decode().strip())
-                    _parse_log_event(event, task_log)
-                except json.JSONDecodeError:
-                    pass
+            # Hand the stream to the shared event pump instead of parking
+            # this worker thread on a blocking read loop. The done event
+            # fires at stdout EOF (process exit or termination on stop).
+            events_done = self._event_pump.register(proc, task_log)
+            events_done.wait(timeout=self.config.claude_code.timeout)
 
-            proc.wait(timeout=self.config.claude_code.timeout)
+            self._wait_for_process(proc, timeout=self.config.claude_code.timeout)
 
             if self._stop_event.is_set():
                 raise Exception("Dispatcher stopped — task aborted")
@@ -863,25 +1611,152 @@ class Dispatcher:
             _mark_task_failed_json(task_id, str(e))
 
         finally:
-            with self._procs_lock:
-                self._active_procs.pop(task_id, None)
-            _save_task_log(task_log)
-            # Cleanup worktree + remote branch (skip during shutdown)
-            if not self._stop_event.is_set():
-                self._cleanup_worktree(task_id)
+            self._active_procs.pop(task_id, None)
+            task_log.close_events_file()
+            if claimed:
+                _save_task_log(task_log)
+            # Cleanup worktree + remote branch (skip during shutdown, and
+            # when the claim was lost — the worktree belongs to whoever
+            # holds the claim); handed to the reaper so the worker slot
+            # frees immediately instead of waiting on git teardown and a
+            # network round-trip.
+            if claimed and not self._stop_event.is_set():
+                self._enqueue_cleanup(task_id)
             self._port_allocator.release(port)
-            logging.getLogger().removeHandler(task_handler)
-            task_handler.close()
+            end_task_logging(task_id, log_token)
+
+    def _worktree_lock(self, task_id: str) -> threading.Lock:
+        """Return the lock serializing git operations in one task's worktree."""
+        with self._worktree_locks_mutex:
+            return self._worktree_locks.setdefault(task_id, threading.Lock())
+
+    def _wait_for_process(self, proc: subprocess.Popen, timeout: float) -> None:
+        """Wait for the child to exit, waking early on dispatcher stop.
+
+        On Linux >= 5.3 the child's pidfd and the stop self-pipe are
+        polled together, so the worker wakes the instant either fires —
+        no busy-polling and no waiting out the full timeout after a stop
+        request. Falls back to a plain proc.wait elsewhere.
+        """
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            proc.wait(timeout=timeout)
+            return
+        try:
+            with selectors.DefaultSelector() as sel:
+                sel.register(pidfd, selectors.EVENT_READ)
+                # Registered but never drained — stop() leaves the pipe
+                # readable so every waiting worker wakes.
+                sel.register(self._stop_pipe_r, selectors.EVENT_READ)
+                deadline = time.monotonic() + timeout
+                while (remaining := deadline - time.monotonic()) > 0:
+                    ready = sel.select(timeout=remaining)
+                    if not ready:
+                        break
+                    if any(key.fd == pidfd for key, _ in ready):
+                        proc.wait()  # child already exited; reaps immediately
+                        return
+                    # Stop requested — terminate and reap
+                    proc.terminate()
+                    proc.wait(timeout=5)
+                    return
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+        finally:
+            os.close(pidfd)
+
+    def _fetch_origin(self, cwd: Path, force: bool = False) -> None:
+        """Fetch origin, skipping if any worker fetched within the TTL.
+
+        Bursty concurrent task starts collapse to a single network
+        round-trip; --no-tags --prune keeps the transfer minimal and drops
+        refs for task branches deleted on the remote. ``force`` bypasses
+        the TTL — used on merge retries, where rebasing onto the same
+        stale origin/main again would just fail the same way.
+        """
+        with self._fetch_lock:
+            if not force and time.monotonic() - self._last_fetch_ts < _FETCH_TTL:
+                return
+            subprocess.run(
+                ["git", "fetch", "--no-tags", "--prune", "origin"],
+                cwd=str(cwd), stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=60,
+            )
+            self._last_fetch_ts = time.monotonic()
+
+    def _request_push(self, timeout: float = 90.0) -> str | None:
+        """Enqueue a push request and wait for the push worker to satisfy it.
+
+        Returns None on success, or an error message. The default timeout
+        must exceed the push subprocess's own 60s timeout, otherwise a
+        slow-but-successful push would be reported here as a failure.
+        """
+        self._ensure_push_worker()
+        req = _PushRequest()
+        self._push_queue.put(req)
+        if not req.done.wait(timeout=timeout):
+            return "push request timed out"
+        return req.error
+
+    def _ensure_push_worker(self) -> None:
+        with self._push_thread_lock:
+            if self._push_thread is None or not self._push_thread.is_alive():
+                self._push_thread = threading.Thread(
+                    target=self._push_loop, daemon=True, name="push-worker",
+                )
+                self._push_thread.start()
+
+    def _push_loop(self) -> None:
+        """Drain push requests in batches and run one `git push` per batch.
+
+        Many waiters are satisfied by a single network round-trip and one
+        pack negotiation, and the root lock is held once per batch instead
+        of once per task.
+        """
+        while not self._stop_event.is_set():
+            try:
+                batch = [self._push_queue.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            # Short coalescing window so tasks finishing together batch up.
+            deadline = time.monotonic() + 0.05
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(self._push_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Any exception here must reach the batch as an error — an
+            # unhandled one would kill the worker thread and leave every
+            # waiter blocked until its timeout.
+            error = None
+            try:
+                with self._root_lock:
+                    push = subprocess.run(
+                        ["git", "push", "origin", "main"],
+                        cwd=str(agent_dir.root), stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE, text=True, timeout=60,
+                    )
+            except subprocess.TimeoutExpired:
+                error = "git push timed out after 60s"
+            except OSError as e:
+                error = f"git push failed to start: {e}"
+            else:
+                if push.returncode != 0:
+                    error = push.stderr.strip() or f"git push exit code {push.returncode}"
+            for req in batch:
+                req.error = error
+                req.done.set()
 
     def _abort_merge(self) -> None:
         """Abort an in-progress merge, falling back to hard reset if needed.
 
-        Must be called while holding ``_git_lock``.
+        Must be called while holding ``_root_lock``.
         """
         root = str(agent_dir.root)
         abort = subprocess.run(
             ["git", "merge", "--abort"],
-            cwd=root, capture_output=True, text=True, timeout=10,
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, timeout=10,
         )
         if abort.returncode != 0:
             logger.warning(
@@ -890,7 +1765,8 @@ class Dispatcher:
             )
             subprocess.run(
                 ["git", "reset", "--hard", "HEAD"],
-                cwd=root, capture_output=True, timeout=10,
+                cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=10,
             )
 
         # Verify the merge state is fully cleared
@@ -907,6 +1783,10 @@ class Dispatcher:
           5. Fetch origin/main → merge into task branch → run tests
           6. Rebase task branch onto origin/main → fast-forward merge to main → push
         Retries from step 5 if rebase/merge/push fails.
+
+        Subprocess output policy: stdout goes to DEVNULL everywhere (git's
+        progress chatter can reach MiBs on big repos) and stderr is only
+        piped where it feeds an exception message or log line.
         """
         branch = f"task/{task_id}"
         root = str(agent_dir.root)
@@ -914,19 +1794,19 @@ class Dispatcher:
 
         for attempt in range(max_retries):
             # Step 5: Merge + Test (in worktree)
-            # Git operations must be serialized across workers because worktrees
-            # share the same .git object database and ref store.  Without the
-            # lock, a concurrent Step 6 (checkout/merge/push in root) can race
-            # with the fetch+merge here and cause spurious failures (rc=1).
-            with self._git_lock:
-                subprocess.run(
-                    ["git", "fetch", "origin"],
-                    cwd=str(worktree_path), capture_output=True, text=True, timeout=60,
-                )
+            # Only this task's worktree lock is needed here — fetch and the
+            # in-worktree merge touch the task branch, not root's HEAD, so
+            # N workers can fetch and merge in parallel. Root-ref movement
+            # (Step 6) stays behind the root writer lock.
+            with self._worktree_lock(task_id):
+                # Retries must see a fresh origin/main — the previous
+                # attempt failed against the one the TTL would re-serve.
+                self._fetch_origin(worktree_path, force=attempt > 0)
 
                 merge_result = subprocess.run(
                     ["git", "merge", "origin/main"],
-                    cwd=str(worktree_path), capture_output=True, text=True, timeout=60,
+                    cwd=str(worktree_path), stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE, text=True, timeout=60,
                 )
                 if merge_result.returncode != 0:
                     raise Exception(
@@ -946,29 +1826,30 @@ class Dispatcher:
                         f"{test_result.stderr.strip() or test_result.stdout.strip()}"
                     )
 
-            # Step 6: Rebase merge to main (under git lock)
-            with self._git_lock:
-                # Fetch latest main in root repo
-                subprocess.run(
-                    ["git", "fetch", "origin", "main"],
-                    cwd=root, capture_output=True, text=True, timeout=60,
-                )
+            # Step 6a: Rebase onto latest origin/main (worktree-scoped)
+            with self._worktree_lock(task_id):
+                # Refresh origin/main (no-op if a worker fetched just now)
+                self._fetch_origin(Path(root))
 
                 # Rebase task branch onto origin/main
                 rebase = subprocess.run(
                     ["git", "rebase", "origin/main"],
-                    cwd=str(worktree_path), capture_output=True, text=True, timeout=60,
+                    cwd=str(worktree_path), stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL, timeout=60,
                 )
                 if rebase.returncode != 0:
                     subprocess.run(
                         ["git", "rebase", "--abort"],
-                        cwd=str(worktree_path), capture_output=True, timeout=10,
+                        cwd=str(worktree_path), stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL, timeout=10,
                     )
                     if attempt < max_retries - 1:
                         logger.warning(f"Rebase failed for {branch} (attempt {attempt + 1}), retrying")
                         continue
                     raise Exception(f"Rebase failed after {max_retries} attempts for {branch}")
 
+            # Step 6b: Advance main (root writer lock)
+            with self._root_lock:
                 # Safety: abort any lingering merge state from a previous crash
                 merge_head = Path(agent_dir.root) / ".git" / "MERGE_HEAD"
                 if merge_head.exists():
@@ -978,7 +1859,8 @@ class Dispatcher:
                 # Checkout main in root
                 checkout = subprocess.run(
                     ["git", "checkout", "main"],
-                    cwd=root, capture_output=True, text=True, timeout=30,
+                    cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                    text=True, timeout=30,
                 )
                 if checkout.returncode != 0:
                     if attempt < max_retries - 1:
@@ -989,9 +1871,14 @@ class Dispatcher:
                         f"{checkout.stderr.strip()}"
                     )
 
-                # Fast-forward merge task branch into main
+                # Fast-forward merge task branch into main. --ff-only:
+                # another worker may have advanced main between the
+                # rebase (worktree lock) and here (root lock); a plain
+                # merge would silently record a merge commit from the
+                # now-stale rebase. Failing instead sends the retry loop
+                # back to re-fetch and re-rebase, keeping history linear.
                 merge = subprocess.run(
-                    ["git", "merge", branch],
+                    ["git", "merge", "--ff-only", branch],
                     cwd=root, capture_output=True, text=True, timeout=60,
                 )
                 if merge.returncode != 0:
@@ -1004,94 +1891,193 @@ class Dispatcher:
                         f"{merge.stderr.strip() or merge.stdout.strip()}"
                     )
 
-                # Push to remote
-                if self.config.push_to_remote:
-                    push = subprocess.run(
-                        ["git", "push", "origin", "main"],
-                        cwd=root, capture_output=True, text=True, timeout=60,
-                    )
-                    if push.returncode != 0:
-                        if attempt < max_retries - 1:
-                            logger.warning(f"Push failed (attempt {attempt + 1}), retrying")
-                            continue
-                        raise Exception(
-                            f"git push origin main failed (rc={push.returncode}): "
-                            f"{push.stderr.strip()}"
-                        )
+            # Push to remote — handed to the coalescing push worker so the
+            # root lock is released before the network round-trip.
+            if self.config.push_to_remote:
+                push_error = self._request_push()
+                if push_error is not None:
+                    if attempt < max_retries - 1:
+                        logger.warning(f"Push failed (attempt {attempt + 1}), retrying")
+                        continue
+                    raise Exception(f"git push origin main failed: {push_error}")
+
+            break  # Success
 
-                break  # Success
+    def _setup_paths(self) -> tuple[list[Path], list[Path], set[Path]]:
+        """Symlink/copy relative paths and their parent dirs, parsed once.
+
+        Worktree setup re-parsed every configured string into Path objects
+        per task; the parsed fragments only change when the config lists
+        do, so they are cached keyed on the list contents.
+        """
+        key = (tuple(self.config.symlink_files), tuple(self.config.copy_files))
+        cached = self._setup_paths_cache
+        if cached is None or cached[0] != key:
+            symlink_rels = [Path(p) for p in self.config.symlink_files]
+            copy_rels = [Path(p) for p in self.config.copy_files]
+            parents = {p.parent for p in (*symlink_rels, *copy_rels)}
+            cached = (key, (symlink_rels, copy_rels, parents))
+            self._setup_paths_cache = cached
+        return cached[1]
 
     def _create_worktree(self, task_id: str) -> Path:
         """Create a git worktree for the task with isolated data and symlinks.
 
-        Worktree creation must be serialized with merges and other worktree
-        operations because ``git worktree add`` reads the current HEAD of
-        the base ref (main) and concurrent merges/checkouts in the root repo
-        can cause races.
+        Runs without the root writer lock: the add starts from the named
+        ``main`` ref (not root's HEAD) and ``--no-track`` keeps branch
+        creation out of the shared config file, so concurrent adds are
+        safe. Removal still serializes on the root lock.
         """
         branch = f"task/{task_id}"
         worktree_path = agent_dir.worktrees / task_id
-        agent_dir.worktrees.mkdir(parents=True, exist_ok=True)
-        with self._git_lock:
-            result = subprocess.run(
-                ["git", "worktree", "add", "-b", branch, str(worktree_path), "main"],
-                cwd=str(agent_dir.root), capture_output=True, text=True, timeout=30,
+        _ensure_dir(agent_dir.worktrees)
+        # Reserve the directory name atomically — a leftover worktree from a
+        # crashed run surfaces here instead of as a git error mid-add.
+        try:
+            worktree_path.mkdir(exist_ok=False)
+        except FileExistsError:
+            raise Exception(f"Worktree path already exists for {task_id}: {worktree_path}")
+        # With --no-track the new branch never touches .git/config, so
+        # concurrent worktree adds are safe without the root writer lock
+        # and bulk task startup parallelizes across workers.
+        result = subprocess.run(
+            ["git", "worktree", "add", "--no-track", "-b", branch, str(worktree_path), "main"],
+            cwd=str(agent_dir.root), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, timeout=30,
+        )
+        if result.returncode != 0:
+            try:
+                worktree_path.rmdir()  # release the reservation if still empty
+            except OSError:
+                pass
+            raise Exception(
+                f"git worktree add failed for {task_id} (rc={result.returncode}): "
+                f"{result.stderr.strip()}"
             )
-            if result.returncode != 0:
-                raise Exception(
-                    f"git worktree add failed for {task_id} (rc={result.returncode}): "
-                    f"{result.stderr.strip()}"
-                )
 
         # Create isolated data/ directory in worktree
         (worktree_path / "data").mkdir(parents=True, exist_ok=True)
 
-        # Symlink shared files (e.g. data/dev-tasks.json → shared across worktrees)
-        for rel_path in self.config.symlink_files:
+        symlink_rels, copy_rels, parent_rels = self._setup_paths()
+
+        # Pre-create parent directories once per distinct parent — several
+        # entries usually share one (e.g. data/), so dedupe the mkdirs.
+        for parent_rel in parent_rels:
+            (worktree_path / parent_rel).mkdir(parents=True, exist_ok=True)
+
+        # Symlink shared files (e.g. data/dev-tasks.json → shared across worktrees).
+        # EAFP: try the symlink and ignore an existing destination rather
+        # than paying a stat on dst per entry.
+        for rel_path in symlink_rels:
             src = agent_dir.root / rel_path
-            dst = worktree_path / rel_path
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            if src.exists() and not dst.exists():
-                dst.symlink_to(src)
+            if not src.exists():
+                continue
+            try:
+                os.symlink(src, worktree_path / rel_path)
+            except FileExistsError:
+                pass
 
         # Symlink logs/ directory so worktree processes share central logs
         logs_src = agent_dir.logs
-        logs_dst = worktree_path / "logs"
-        logs_src.mkdir(parents=True, exist_ok=True)
-        if not logs_dst.exists():
-            logs_dst.symlink_to(logs_src)
-
-        # Copy files (isolated per worktree, e.g. CLAUDE.md, PROGRESS.md)
-        for name in self.config.copy_files:
-            src = agent_dir.root / name
-            if src.exists():
-                dst = worktree_path / name
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(str(src), str(dst))
+        _ensure_dir(logs_src)
+        try:
+            os.symlink(logs_src, worktree_path / "logs")
+        except FileExistsError:
+            pass
+
+        # Copy files (isolated per worktree, e.g. CLAUDE.md, PROGRESS.md).
+        # copyfile uses sendfile(2) on Linux and skips copy2's metadata
+        # syscalls; no hard links here — these files exist precisely so
+        # each worker can edit its own copy.
+        for rel_path in copy_rels:
+            try:
+                shutil.copyfile(str(agent_dir.root / rel_path), str(worktree_path / rel_path))
+            except FileNotFoundError:
+                pass
 
         return worktree_path
 
+    def _enqueue_cleanup(self, task_id: str) -> None:
+        """Queue a worktree for teardown by the reaper thread."""
+        self._ensure_reaper()
+        self._cleanup_queue.put(task_id)
+
+    def _ensure_reaper(self) -> None:
+        with self._reaper_thread_lock:
+            if self._reaper_thread is None or not self._reaper_thread.is_alive():
+                self._reaper_thread = threading.Thread(
+                    target=self._reaper_loop, daemon=True, name="worktree-reaper",
+                )
+                self._reaper_thread.start()
+
+    def _reaper_loop(self) -> None:
+        """Tear down finished worktrees in batches.
+
+        Remote branch deletes are coalesced — one `git push origin
+        --delete a b c ...` per batch — so N finishing tasks pay one
+        network round-trip instead of N.
+        """
+        while not self._stop_event.is_set():
+            try:
+                batch = [self._cleanup_queue.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + 0.1
+            while len(batch) < 32 and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(self._cleanup_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            for task_id in batch:
+                try:
+                    self._cleanup_worktree_local(task_id)
+                except Exception:
+                    logger.exception(f"Worktree cleanup failed for {task_id}")
+            if self.config.push_to_remote:
+                self._delete_remote_branches(batch)
+
     def _cleanup_worktree(self, task_id: str):
-        """Remove a git worktree, its branch, and the remote branch."""
+        """Remove a git worktree, its branch, and the remote branch (synchronous)."""
+        self._cleanup_worktree_local(task_id)
+        if self.config.push_to_remote:
+            self._delete_remote_branches([task_id])
+
+    def _cleanup_worktree_local(self, task_id: str) -> None:
+        """Remove the worktree directory and local branch for a task."""
         worktree_path = agent_dir.worktrees / task_id
-        with self._git_lock:
+        with self._root_lock:
             subprocess.run(
                 ["git", "worktree", "remove", str(worktree_path), "--force"],
-                cwd=str(agent_dir.root), capture_output=True, timeout=30,
+                cwd=str(agent_dir.root), stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=30,
             )
             subprocess.run(
                 ["git", "branch", "-D", f"task/{task_id}"],
-                cwd=str(agent_dir.root), capture_output=True, timeout=30,
+                cwd=str(agent_dir.root), stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=30,
             )
-            # Delete remote branch
-            if self.config.push_to_remote:
-                subprocess.run(
-                    ["git", "push", "origin", "--delete", f"task/{task_id}"],
-                    cwd=str(agent_dir.root), capture_output=True, timeout=30,
-                )
+        with self._worktree_locks_mutex:
+            self._worktree_locks.pop(task_id, None)
+
+    def _delete_remote_branches(self, task_ids: list[str]) -> None:
+        subprocess.run(
+            ["git", "push", "origin", "--delete", *(f"task/{t}" for t in task_ids)],
+            cwd=str(agent_dir.root), stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, timeout=60,
+        )
+
+
+_dispatcher_init_lock = threading.Lock()
 
 
-_dispatcher = Dispatcher(AGENT_CONFIG)
+def _get_dispatcher() -> Dispatcher:
+    """Construct the dispatcher on first use (lazy, double-checked)."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_init_lock:
+            if _dispatcher is None:
+                _dispatcher = Dispatcher(get_agent_config())
+    return _dispatcher
 
 # ---------------------------------------------------------------------------
 # FastAPI app
@@ -1100,7 +2086,10 @@ _dispatcher = Dispatcher(AGENT_CONFIG)
 ALLOWED_IMAGE_TYPES = {"png", "jpg", "jpeg", "gif", "webp"}
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
 
-app = FastAPI(title="Baton Agent", version="0.1.0")
+# orjson-backed responses when available — list endpoints serialize large
+# dicts straight to bytes in C instead of going through stdlib json.
+_response_class = ORJSONResponse if orjson is not None else JSONResponse
+app = FastAPI(title="Baton Agent", version="0.1.0", default_response_class=_response_class)
 
 # Mount uploads directory for static file serving
 _uploads_dir = agent_dir.uploads
@@ -1110,30 +2099,43 @@ app.mount("/uploads", StaticFiles(directory=str(_uploads_dir)), name="uploads")
 
 @app.on_event("shutdown")
 async def shutdown():
-    _dispatcher.stop()
+    if _dispatcher is not None:
+        _dispatcher.stop()
 
 
 @app.get("/agent/health")
-async def health():
+def health():
     return {"healthy": agent_dir.data.is_dir()}
 
 
 # -- Tasks --
 
 @app.get("/agent/tasks")
-async def all_tasks() -> dict[str, list[TaskSummary]]:
+def all_tasks() -> dict[str, list[dict]]:
     return {status: _list_tasks(status) for status in STATUSES}
 
 
 @app.get("/agent/tasks/{status}")
-async def tasks_by_status(status: str) -> list[TaskSummary]:
+def tasks_by_status(status: str) -> list[dict]:
     if status not in STATUSES:
         raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     return _list_tasks(status)
 
 
+# Registered before the {status}/{filename} catch-all below — Starlette
+# matches routes in registration order, and both patterns span two path
+# segments under /agent/tasks/.
+@app.get("/agent/tasks/{task_id}/session-log")
+def session_log(task_id: str):
+    """Stream the session log for a task (events as a JSON array)."""
+    stream = _stream_session_log(task_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Session log not found")
+    return StreamingResponse(stream, media_type="application/json")
+
+
 @app.get("/agent/tasks/{status}/{filename}")
-async def task_detail(status: str, filename: str) -> TaskDetail:
+def task_detail(status: str, filename: str) -> TaskDetail:
     task = _read_task(status, filename)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -1141,14 +2143,14 @@ async def task_detail(status: str, filename: str) -> TaskDetail:
 
 
 @app.post("/agent/tasks")
-async def create_task(body: TaskCreateRequest) -> TaskDetail:
+def create_task(body: TaskCreateRequest) -> TaskDetail:
     return _create_task(body.title, body.content, body.task_type, body.needs_plan_review)
 
 
 # -- Plan Review --
 
 @app.post("/agent/tasks/{task_id}/approve-plan")
-async def approve_plan(task_id: str):
+def approve_plan(task_id: str):
     """Approve a plan: move task from plan_review to pending (plan_content stays in JSON)."""
     data = _load_dev_tasks()
     t = data.get("tasks", {}).get(task_id)
@@ -1159,28 +2161,29 @@ async def approve_plan(task_id: str):
 
 
 @app.post("/agent/tasks/{task_id}/revise-plan")
-async def revise_plan(task_id: str, body: PlanReviewRequest):
+def revise_plan(task_id: str, body: PlanReviewRequest):
     """Revise a plan: append feedback to content, clear plan, move to pending for re-planning."""
-    data = _load_dev_tasks()
-    t = data.get("tasks", {}).get(task_id)
-    if not t or t.get("status") != "plan_review":
-        raise HTTPException(status_code=404, detail="Task not found in plan_review")
+    # Single locked read-modify-write — the status check happens on the
+    # same snapshot that is mutated, so there is no window for the task
+    # to change state between check and update.
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            if body.feedback.strip():
-                task["content"] = task.get("content", "") + f"\n\n## Revision Feedback\n\n{body.feedback}\n"
-            task["plan_content"] = None
-            task["status"] = "pending"
-            task["modified"] = datetime.now(timezone.utc).isoformat()
-            task["worker_port"] = None
-            _save_dev_tasks(data)
+        task = _load_dev_tasks_readonly()["tasks"].get(task_id)
+        if not task or task.get("status") != "plan_review":
+            raise HTTPException(status_code=404, detail="Task not found in plan_review")
+        fields = {
+            "plan_content": None,
+            "status": "pending",
+            "modified": datetime.now(timezone.utc).isoformat(),
+            "worker_port": None,
+        }
+        if body.feedback.strip():
+            fields["content"] = task.get("content", "") + f"\n\n## Revision Feedback\n\n{body.feedback}\n"
+        _append_task_mutation(task_id, fields)
     return {"status": "revised", "task_id": task_id}
 
 
 @app.post("/agent/tasks/{task_id}/reject-plan")
-async def reject_plan(task_id: str):
+def reject_plan(task_id: str):
     """Reject a plan: mark task as failed."""
     data = _load_dev_tasks()
     t = data.get("tasks", {}).get(task_id)
@@ -1191,57 +2194,77 @@ async def reject_plan(task_id: str):
 
 
 @app.post("/agent/tasks/{task_id}/rerun")
-async def rerun_task(task_id: str):
+def rerun_task(task_id: str):
     """Rerun a failed task: clear error, reset to pending so dispatcher picks it up."""
-    data = _load_dev_tasks()
-    t = data.get("tasks", {}).get(task_id)
-    if not t or t.get("status") != "failed":
-        raise HTTPException(status_code=404, detail="Task not found in failed")
-    now = datetime.now(timezone.utc).isoformat()
     with _dev_tasks_lock:
-        data = _load_dev_tasks()
-        task = data["tasks"].get(task_id)
-        if task:
-            task["status"] = "pending"
-            task["modified"] = now
-            task["worker_port"] = None
-            task["error"] = None
-            _save_dev_tasks(data)
+        task = _load_dev_tasks_readonly()["tasks"].get(task_id)
+        if not task or task.get("status") != "failed":
+            raise HTTPException(status_code=404, detail="Task not found in failed")
+        _append_task_mutation(task_id, {
+            "status": "pending",
+            "modified": datetime.now(timezone.utc).isoformat(),
+            "worker_port": None,
+            "error": None,
+        })
     return {"status": "requeued", "task_id": task_id}
 
 
 # -- Git --
 
+def _git_state_etag() -> str:
+    """Weak ETag over the current worktree list and their HEAD commits.
+
+    Derived from the `_get_worktrees` result rather than `.git` directory
+    mtimes: commits made inside a worktree advance a nested ref file
+    (refs/heads/task/<id>) and the worktree's private HEAD, neither of
+    which moves the top-level directory mtimes a stat-based key would
+    see. `_get_worktrees` is TTL-cached, so staleness is bounded by
+    `_GIT_CACHE_TTL` instead of lasting for the life of a task.
+    """
+    h = hashlib.md5(usedforsecurity=False)
+    for wt in _get_worktrees():
+        h.update(f"{wt.path}\x00{wt.branch}\x00{wt.commit}\x00".encode())
+    return f'W/"{h.hexdigest()}"'
+
+
 @app.get("/agent/worktrees")
-async def worktrees() -> list[WorktreeInfo]:
+def worktrees(request: Request, response: Response) -> list[WorktreeInfo]:
+    etag = _git_state_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return _get_worktrees()
 
 
 @app.get("/agent/commits")
-async def commits(count: int = 10) -> list[GitLogEntry]:
+def commits(request: Request, response: Response, count: int = 10) -> list[GitLogEntry]:
+    etag = _git_state_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return _get_recent_commits(count)
 
 
 # -- Dispatcher --
 
 @app.get("/agent/dispatcher")
-async def dispatcher_status() -> DispatcherStatus:
-    return _dispatcher.get_status()
+def dispatcher_status() -> DispatcherStatus:
+    return _get_dispatcher().get_status()
 
 
 @app.post("/agent/dispatcher/start")
-async def dispatcher_start() -> DispatcherStatus:
-    return _dispatcher.start()
+def dispatcher_start() -> DispatcherStatus:
+    return _get_dispatcher().start()
 
 
 @app.post("/agent/dispatcher/stop")
-async def dispatcher_stop() -> DispatcherStatus:
-    return _dispatcher.stop()
+def dispatcher_stop() -> DispatcherStatus:
+    return _get_dispatcher().stop()
 
 
 @app.post("/agent/dispatcher/restart")
-async def dispatcher_restart() -> DispatcherStatus:
-    return _dispatcher.restart()
+def dispatcher_restart() -> DispatcherStatus:
+    return _get_dispatcher().restart()
 
 
 # -- Chat --
@@ -1263,7 +2286,7 @@ async def agent_chat(body: ChatRequest):
 
 
 @app.post("/agent/tasks/bulk")
-async def create_tasks_bulk(body: BulkTaskCreateRequest) -> list[TaskDetail]:
+def create_tasks_bulk(body: BulkTaskCreateRequest) -> list[TaskDetail]:
     """Create multiple tasks at once (used after plan confirmation)."""
     return [_create_task(t.title, t.content, t.task_type) for t in body.tasks]
 
@@ -1283,16 +2306,28 @@ async def upload_image(file: UploadFile = File(...)):
             detail=f"File type '{ext}' not allowed. Allowed: {', '.join(sorted(ALLOWED_IMAGE_TYPES))}",
         )
 
-    data = await file.read()
-    if len(data) > MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large ({len(data)} bytes). Maximum: {MAX_UPLOAD_SIZE} bytes",
-        )
-
     uuid_name = f"{uuid.uuid4().hex}.{ext}"
     save_path = agent_dir.uploads / uuid_name
-    save_path.write_bytes(data)
+
+    # Stream to disk in bounded chunks — peak memory stays at one chunk
+    # instead of the whole body, and over-limit uploads are rejected
+    # mid-stream without buffering the rest.
+    fd = os.open(save_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    total = 0
+    try:
+        while chunk := await file.read(256 * 1024):
+            total += len(chunk)
+            if total > MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File too large (>{MAX_UPLOAD_SIZE} bytes)",
+                )
+            os.write(fd, chunk)
+    except BaseException:
+        os.close(fd)
+        save_path.unlink(missing_ok=True)
+        raise
+    os.close(fd)
 
     return {
         "filename": uuid_name,
@@ -1314,10 +2349,9 @@ def main():
     args = parser.parse_args()
 
     if args.project_dir:
-        global agent_dir, AGENT_CONFIG, _dispatcher
+        global agent_dir
         agent_dir = AgentDir.resolve(args.project_dir)
-        AGENT_CONFIG = _load_agent_config(agent_dir.root)
-        _dispatcher = Dispatcher(AGENT_CONFIG)
+        # Config and dispatcher resolve lazily against the new agent_dir.
         # Remount uploads directory for the new project dir
         uploads_dir = agent_dir.uploads
         uploads_dir.mkdir(parents=True, exist_ok=True)
@@ -1328,21 +2362,30 @@ def main():
     setup_logging(level=args.log_level, project_dir=agent_dir.root)
 
     # Auto-start the dispatcher
-    _dispatcher.start()
+    dispatcher = _get_dispatcher()
+    dispatcher.start()
 
     def _shutdown_handler(signum, frame):
         logger.info(f"Received signal {signum}, shutting down dispatcher...")
-        _dispatcher.stop()
+        dispatcher.stop()
         raise SystemExit(0)
 
     signal.signal(signal.SIGTERM, _shutdown_handler)
 
+    # uvloop's libuv-backed event loop cuts per-request overhead on the
+    # streaming chat path; optional, like orjson.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     import uvicorn
     try:
         uvicorn.run(app, host=args.host, port=args.port)
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt received, shutting down...")
-        _dispatcher.stop()
+        dispatcher.stop()
 
 
 if __name__ == "__main__":
@@ -9,9 +9,29 @@ import asyncio
 import json
 import logging
 from collections.abc import AsyncIterator
+from functools import lru_cache
+
+try:  # optional speedup, as in backend.agent
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _sse(obj: dict) -> bytes:
+    """Frame one SSE data event; orjson emits bytes directly."""
+    if orjson is not None:
+        payload = orjson.dumps(obj)
+    else:
+        payload = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    return b"data: " + payload + b"\n\n"
+
+
 SYSTEM_PROMPT = """\
 You are a task planner for the project "{project_name}".
 {project_description}
@@ -51,6 +71,9 @@ agent to execute without further context
 """
 
 
+# The inputs are fixed per project, so every chat request would rebuild
+# the same multi-KB string; memoize instead.
+@lru_cache(maxsize=8)
 def build_system_prompt(project_name: str, project_description: str = "") -> str:
     desc = f"Project description: {project_description}" if project_description else ""
     return SYSTEM_PROMPT.format(
@@ -75,7 +98,7 @@ async def chat_stream(
     messages: list[dict],
     system: str,
     session_id: str | None = None,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """Stream chat response as SSE-formatted text chunks.
 
     Spawns a Claude Code CLI subprocess with stream-json output.
@@ -85,7 +108,7 @@ async def chat_stream(
     last_message = messages[-1]["content"] if messages else ""
     if not last_message:
         logger.warning("chat_stream called with no message content")
-        yield f"data: {json.dumps({'type': 'error', 'error': 'No message provided'})}\n\n"
+        yield _sse({"type": "error", "error": "No message provided"})
         return
 
     cmd = _build_chat_command(system, session_id)
@@ -112,14 +135,32 @@ async def chat_stream(
         text_chunks_yielded = 0
         total_text_length = 0
 
-        async for line in proc.stdout:
-            line = line.decode().strip()
-            if not line:
+        async def _lines() -> AsyncIterator[bytes]:
+            # Chunked reads instead of per-event readline: one await per
+            # 64 KiB of output, with complete lines split off a carry
+            # buffer (same idiom as the agent's event pump).
+            buf = b""
+            while True:
+                chunk = await proc.stdout.read(65536)
+                if not chunk:
+                    if buf:
+                        yield buf
+                    return
+                data = buf + chunk if buf else chunk
+                *complete, buf = data.split(b"\n")
+                for raw in complete:
+                    yield raw
+
+        async for line in _lines():
+            if not line.strip():
                 continue
             try:
-                event = json.loads(line)
+                event = _json_loads(line)
             except json.JSONDecodeError:
-                logger.warning("chat_stream: non-JSON line from subprocess: %.200s", line)
+                logger.warning(
+                    "chat_stream: non-JSON line from subprocess: %.200s",
+                    line.decode("utf-8", "replace"),
+                )
                 continue
 
             event_count += 1
@@ -146,7 +187,7 @@ async def chat_stream(
                         if text:
                             text_chunks_yielded += 1
                             total_text_length += len(text)
-                            yield f"data: {json.dumps({'type': 'text', 'text': text})}\n\n"
+                            yield _sse({"type": "text", "text": text})
                         else:
                             logger.warning(
                                 "chat_stream: assistant text block with empty content"
@@ -168,7 +209,7 @@ async def chat_stream(
                     if text:
                         text_chunks_yielded += 1
                         total_text_length += len(text)
-                        yield f"data: {json.dumps({'type': 'text', 'text': text})}\n\n"
+                        yield _sse({"type": "text", "text": text})
                     else:
                         logger.debug("chat_stream: content_block_delta with empty text")
                 else:
@@ -212,17 +253,17 @@ async def chat_stream(
             stderr = await proc.stderr.read()
             error_msg = stderr.decode().strip() if stderr else f"Claude Code exited with code {proc.returncode}"
             logger.error("chat_stream subprocess failed: %s", error_msg)
-            yield f"data: {json.dumps({'type': 'error', 'error': error_msg})}\n\n"
+            yield _sse({"type": "error", "error": error_msg})
             return
 
-        yield f"data: {json.dumps({'type': 'done', 'session_id': result_session_id})}\n\n"
+        yield _sse({"type": "done", "session_id": result_session_id})
 
     except FileNotFoundError:
         logger.error("Claude Code CLI not found on PATH")
-        yield f"data: {json.dumps({'type': 'error', 'error': 'Claude Code CLI not found. Install it with: npm install -g @anthropic-ai/claude-code'})}\n\n"
+        yield _sse({"type": "error", "error": "Claude Code CLI not found. Install it with: npm install -g @anthropic-ai/claude-code"})
     except Exception as e:
         logger.error("Chat stream error: %s", e, exc_info=True)
-        yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+        yield _sse({"type": "error", "error": str(e)})
 
 
 def _extract_json(text: str) -> dict:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import subprocess
 import uuid
 from datetime import datetime, timezone
@@ -14,9 +15,30 @@ from backend.config import ProjectConfig
 from backend.connectors.base import ProjectConnector
 from backend.models import GitLogEntry, TaskDetail, TaskSummary, TaskType, TASK_TYPE_VALUES, WorktreeInfo
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _git_read_env() -> dict[str, str]:
+    """Env for read-only git commands — skip optional lock files so
+    dashboard reads never contend with agent-side merges."""
+    return {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
 class LocalConnector(ProjectConnector):
     def __init__(self, config: ProjectConfig):
         self.config = config
@@ -26,19 +48,60 @@ class LocalConnector(ProjectConnector):
     def _dev_tasks_path(self) -> Path:
         return self.data_path / "dev-tasks.json"
 
+    def _dev_tasks_log_path(self) -> Path:
+        return self.data_path / "dev-tasks.log"
+
     def _load_dev_tasks(self) -> dict:
         path = self._dev_tasks_path()
-        if not path.exists():
-            return {"tasks": {}}
+        data: dict = {"tasks": {}}
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
+            loaded = _json_loads(path.read_bytes())
+            if isinstance(loaded, dict):
+                data = loaded
+                data.setdefault("tasks", {})
         except (json.JSONDecodeError, OSError):
-            return {"tasks": {}}
+            pass
+        self._replay_log(data)
+        return data
+
+    def _replay_log(self, data: dict) -> None:
+        """Replay the agent's append-only mutation log (dev-tasks.log).
+
+        The agent batches mutations in the WAL between compactions, so
+        reading only the snapshot would show stale task state here.
+        """
+        try:
+            with open(self._dev_tasks_log_path(), encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = _json_loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    task_id = record.get("id")
+                    if task_id:
+                        data["tasks"].setdefault(task_id, {}).update(record.get("fields", {}))
+        except OSError:
+            pass
 
     def _save_dev_tasks(self, data: dict) -> None:
         path = self._dev_tasks_path()
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp = str(path) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps_pretty(data))
+        os.replace(tmp, path)
+        # data already includes the replayed WAL, so this rewrite doubles
+        # as a compaction. Truncate (don't unlink) the log so the agent
+        # never replays the entries we just folded in over this write,
+        # and so worktree symlinks to it stay valid.
+        try:
+            with open(self._dev_tasks_log_path(), "w", encoding="utf-8"):
+                pass
+        except OSError:
+            pass
 
     def list_tasks(self, status: str) -> list[TaskSummary]:
         data = self._load_dev_tasks()
@@ -115,15 +178,11 @@ class LocalConnector(ProjectConnector):
         except (ValueError, TypeError):
             modified = datetime.now(timezone.utc)
 
-        session_log = None
-        log_path = self.data_path / f"{task_id}.log.json"
-        if log_path.exists():
-            try:
-                session_log = json.loads(log_path.read_text(encoding="utf-8"))
-                if not isinstance(session_log, list):
-                    session_log = [session_log]
-            except (json.JSONDecodeError, OSError):
-                session_log = None
+        # Session logs can be large — only report availability here.
+        has_session_log = (
+            (self.data_path / f"{task_id}.events.ndjson").exists()
+            or (self.data_path / f"{task_id}.log.json").exists()
+        )
 
         return TaskDetail(
             id=task_id,
@@ -136,7 +195,7 @@ class LocalConnector(ProjectConnector):
             needs_plan_review=t.get("needs_plan_review", False),
             plan_content=t.get("plan_content"),
             error_log=t.get("error"),
-            session_log=session_log,
+            has_session_log=has_session_log,
         )
 
     def get_worktrees(self) -> list[WorktreeInfo]:
@@ -144,9 +203,10 @@ class LocalConnector(ProjectConnector):
             return []
         try:
             result = subprocess.run(
-                ["git", "worktree", "list", "--porcelain"],
+                ["git", "worktree", "list", "--porcelain", "-z"],
                 cwd=self.project_path,
-                capture_output=True, text=True, timeout=10,
+                capture_output=True, timeout=10,
+                env=_git_read_env(),
             )
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return []
@@ -154,32 +214,36 @@ class LocalConnector(ProjectConnector):
             return []
         return self._parse_worktrees(result.stdout)
 
+    # NUL-delimited fields/records (-z): immune to commit messages that
+    # contain the separator, and parsed with one bytes.split. Only kept
+    # fields are decoded.
+    _GIT_LOG_FORMAT = "%H%x00%s%x00%an%x00%ci%x00%D"
+    _GIT_LOG_FIELDS = 5
+
     def get_recent_commits(self, count: int = 10) -> list[GitLogEntry]:
         if not self.project_path.is_dir():
             return []
-        sep = "---BATON-SEP---"
-        fmt = f"%H{sep}%s{sep}%an{sep}%ci{sep}%D"
         try:
             result = subprocess.run(
-                ["git", "log", f"--max-count={count}", f"--format={fmt}"],
+                ["git", "log", "-z", f"--max-count={count}", f"--format={self._GIT_LOG_FORMAT}"],
                 cwd=self.project_path,
-                capture_output=True, text=True, timeout=10,
+                capture_output=True, timeout=10,
+                env=_git_read_env(),
             )
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return []
         if result.returncode != 0:
             return []
+        fields = result.stdout.split(b"\x00")
+        n = self._GIT_LOG_FIELDS
         entries = []
-        for line in result.stdout.strip().splitlines():
-            parts = line.split(sep)
-            if len(parts) < 4:
-                continue
+        for i in range(0, len(fields) - (n - 1), n):
             entries.append(GitLogEntry(
-                sha=parts[0],
-                message=parts[1],
-                author=parts[2],
-                date=parts[3],
-                branch=parts[4] if len(parts) > 4 else "",
+                sha=fields[i].decode(errors="replace"),
+                message=fields[i + 1].decode(errors="replace"),
+                author=fields[i + 2].decode(errors="replace"),
+                date=fields[i + 3].decode(errors="replace"),
+                branch=fields[i + 4].decode(errors="replace"),
             ))
         return entries
 
@@ -225,33 +289,22 @@ class LocalConnector(ProjectConnector):
         raise NotImplementedError("Rerun requires an agent connection")
 
     @staticmethod
-    def _parse_worktrees(output: str) -> list[WorktreeInfo]:
+    def _parse_worktrees(output: bytes) -> list[WorktreeInfo]:
+        # -z output: attribute lines are NUL-terminated and records end
+        # with an extra NUL, so records split cleanly on b"\x00\x00".
         worktrees = []
-        current: dict[str, str] = {}
-        for line in output.splitlines():
-            if not line.strip():
-                if current:
-                    worktrees.append(WorktreeInfo(
-                        path=current.get("worktree", ""),
-                        branch=current.get("branch", "").replace("refs/heads/", ""),
-                        commit=current.get("HEAD", ""),
-                        is_bare=current.get("bare", "") == "bare",
-                    ))
-                    current = {}
-                continue
-            if line.startswith("worktree "):
-                current["worktree"] = line[len("worktree "):]
-            elif line.startswith("HEAD "):
-                current["HEAD"] = line[len("HEAD "):]
-            elif line.startswith("branch "):
-                current["branch"] = line[len("branch "):]
-            elif line == "bare":
-                current["bare"] = "bare"
-        if current:
-            worktrees.append(WorktreeInfo(
-                path=current.get("worktree", ""),
-                branch=current.get("branch", "").replace("refs/heads/", ""),
-                commit=current.get("HEAD", ""),
-                is_bare=current.get("bare", "") == "bare",
-            ))
+        for record in output.split(b"\x00\x00"):
+            attrs: dict[str, str] = {}
+            for line in record.split(b"\x00"):
+                if not line:
+                    continue
+                key, _, value = line.decode(errors="replace").partition(" ")
+                attrs[key] = value
+            if attrs:
+                worktrees.append(WorktreeInfo(
+                    path=attrs.get("worktree", ""),
+                    branch=attrs.get("branch", "").replace("refs/heads/", ""),
+                    commit=attrs.get("HEAD", ""),
+                    is_bare="bare" in attrs,
+                ))
         return worktrees
@@ -10,9 +10,12 @@ directory, with automatic rotation at 5 MB (3 backups kept).
 """
 from __future__ import annotations
 
+import contextvars
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 _configured = False
@@ -73,11 +76,7 @@ def create_task_handler(
     project_dir: str | Path | None = None,
     level: str | int = "INFO",
 ) -> logging.FileHandler:
-    """Create a file handler that writes to ``logs/{task_id}.log``.
-
-    Attach to the root logger at the start of task execution and remove
-    in the ``finally`` block so each task gets its own log file.
-    """
+    """Create a file handler that writes to ``logs/{task_id}.log``."""
     if isinstance(level, str):
         level = getattr(logging, level.upper(), logging.INFO)
     if project_dir is None:
@@ -92,6 +91,90 @@ def create_task_handler(
     return handler
 
 
+# ---------------------------------------------------------------------------
+# Per-task log routing — one shared queue instead of per-task root handlers
+# ---------------------------------------------------------------------------
+
+# Task id bound to the thread/context doing the task's work. Records from
+# helper threads can override it with a ``task_id`` extra on the record.
+_task_id_var: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "baton_task_id", default=None,
+)
+
+
+class TaskLogRouter(logging.Handler):
+    """Dispatches records to per-task log files based on the active task id.
+
+    A single router (behind a QueueHandler) replaces attaching one
+    FileHandler per running task to the root logger — with N parallel
+    tasks that duplicated every record into every task file, making
+    logging cost O(records x active_tasks). The router formats each
+    record once and writes it only to the file of the task it belongs to.
+    """
+
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._handlers: dict[str, logging.FileHandler] = {}
+
+    def register_task(self, task_id: str, project_dir: str | Path | None = None) -> None:
+        with self.lock:
+            if task_id not in self._handlers:
+                self._handlers[task_id] = create_task_handler(task_id, project_dir)
+
+    def unregister_task(self, task_id: str) -> None:
+        with self.lock:
+            handler = self._handlers.pop(task_id, None)
+        if handler is not None:
+            handler.close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        task_id = getattr(record, "task_id", None) or _task_id_var.get()
+        if task_id is None:
+            return
+        with self.lock:
+            handler = self._handlers.get(task_id)
+        if handler is not None:
+            handler.handle(record)
+
+
+_router: TaskLogRouter | None = None
+_listener: QueueListener | None = None
+_router_lock = threading.Lock()
+
+
+def _ensure_router() -> TaskLogRouter:
+    """Attach the shared QueueHandler + listener to the root logger once."""
+    global _router, _listener
+    with _router_lock:
+        if _router is None:
+            _router = TaskLogRouter()
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            logging.getLogger().addHandler(QueueHandler(log_queue))
+            _listener = QueueListener(log_queue, _router)
+            _listener.start()
+        return _router
+
+
+def begin_task_logging(
+    task_id: str, project_dir: str | Path | None = None,
+) -> contextvars.Token:
+    """Start routing this context's records to ``logs/{task_id}.log``.
+
+    Returns the context token to hand back to ``end_task_logging`` in the
+    task's ``finally`` block.
+    """
+    router = _ensure_router()
+    router.register_task(task_id, project_dir)
+    return _task_id_var.set(task_id)
+
+
+def end_task_logging(task_id: str, token: contextvars.Token) -> None:
+    """Stop routing records for a task and close its log file."""
+    _task_id_var.reset(token)
+    if _router is not None:
+        _router.unregister_task(task_id)
+
+
 def reset() -> None:
     """Reset configuration flag — for testing only."""
     global _configured
@@ -50,6 +50,7 @@ class TaskDetail(BaseModel):
     plan_content: str | None = None
     error_log: str | None = None
     session_log: list[dict] | None = None
+    has_session_log: bool = False
     pr: PRInfo | None = None
 
 
@@ -44,10 +44,20 @@ async def startup():
     logger.info("Dashboard started, %d projects loaded", len(get_config().projects))
 
 
+# One connector per project, reused across requests. HTTPConnector owns
+# persistent httpx clients with keep-alive pools, so rebuilding it per
+# request paid a fresh TCP connect for every dashboard call and every
+# chat stream. Keyed on agent_url so a config change swaps the connector.
+_connectors: dict[tuple[str, str | None], ProjectConnector] = {}
+
+
 def _make_connector(cfg: ProjectConfig) -> ProjectConnector:
-    if cfg.agent_url:
-        return HTTPConnector(cfg.agent_url)
-    return LocalConnector(cfg)
+    key = (cfg.id, cfg.agent_url)
+    conn = _connectors.get(key)
+    if conn is None:
+        conn = HTTPConnector(cfg.agent_url) if cfg.agent_url else LocalConnector(cfg)
+        _connectors[key] = conn
+    return conn
 
 
 def _get_connector(project_id: str) -> ProjectConnector:
@@ -67,7 +77,7 @@ async def home(request: Request):
 # ---- API routes ----
 
 @app.get("/api/projects")
-async def api_projects() -> list[ProjectSummary]:
+def api_projects() -> list[ProjectSummary]:
     config = get_config()
     result = []
     for p in config.projects:
@@ -86,13 +96,13 @@ async def api_projects() -> list[ProjectSummary]:
 
 
 @app.get("/api/projects/{project_id}/tasks")
-async def api_tasks(project_id: str):
+def api_tasks(project_id: str):
     conn = _get_connector(project_id)
     return conn.get_all_tasks()
 
 
 @app.get("/api/projects/{project_id}/tasks/{status}/{filename}")
-async def api_task_detail(project_id: str, status: str, filename: str):
+def api_task_detail(project_id: str, status: str, filename: str):
     conn = _get_connector(project_id)
     task = conn.read_task(status, filename)
     if task is None:
@@ -109,7 +119,7 @@ async def api_task_detail(project_id: str, status: str, filename: str):
 
 
 @app.post("/api/projects/{project_id}/tasks")
-async def api_create_task(project_id: str, body: TaskCreateRequest) -> TaskDetail:
+def api_create_task(project_id: str, body: TaskCreateRequest) -> TaskDetail:
     conn = _get_connector(project_id)
     try:
         task = conn.create_task(body.title, body.content, body.task_type.value, body.needs_plan_review)
@@ -157,13 +167,13 @@ async def api_rerun_task(project_id: str, task_id: str):
 
 
 @app.get("/api/projects/{project_id}/worktrees")
-async def api_worktrees(project_id: str):
+def api_worktrees(project_id: str):
     conn = _get_connector(project_id)
     return conn.get_worktrees()
 
 
 @app.get("/api/projects/{project_id}/commits")
-async def api_commits(project_id: str, count: int = 10):
+def api_commits(project_id: str, count: int = 10):
     conn = _get_connector(project_id)
     return conn.get_recent_commits(count)
 
@@ -221,6 +231,13 @@ def main():
 
     setup_logging(level=args.log_level)
 
+    # Optional, like orjson: uvloop speeds up the proxied SSE/chat paths.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     import uvicorn
 
     kwargs: dict = dict(host=args.host, port=args.port)
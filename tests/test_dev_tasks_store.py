@@ -0,0 +1,170 @@
+"""Tests for the JSON task store — WAL replay, compaction, and cache
+invalidation.
+
+The agent appends mutations to data/dev-tasks.log and folds them into the
+dev-tasks.json snapshot on compaction; every reader (agent cache, worktree
+workers via symlink, LocalConnector fallback) must see snapshot + WAL.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+import backend.agent as agent
+from backend.agent import (
+    AgentDir,
+    _add_task_to_json,
+    _load_dev_tasks,
+    _mark_task_complete_json,
+    _save_dev_tasks,
+)
+from backend.config import ProjectConfig
+from backend.connectors.local import LocalConnector
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def tmp_agent_dir(tmp_path):
+    """Create a temporary AgentDir and patch backend.agent.agent_dir.
+
+    Resets the store's module-level cache and WAL handle so each test
+    starts from a cold read, as a fresh process would.
+    """
+    ad = AgentDir(root=tmp_path)
+    (tmp_path / "data").mkdir(parents=True)
+    with agent._dev_tasks_lock:
+        agent._close_wal_handle()
+        agent._dev_tasks_cache = None
+        agent._dev_tasks_status_index = {}
+    with patch("backend.agent.agent_dir", ad):
+        yield ad
+    with agent._dev_tasks_lock:
+        agent._close_wal_handle()
+        agent._dev_tasks_cache = None
+        agent._dev_tasks_status_index = {}
+
+
+def _drop_memory_state():
+    """Forget in-memory store state, simulating a process restart."""
+    with agent._dev_tasks_lock:
+        agent._close_wal_handle()
+        agent._dev_tasks_cache = None
+        agent._dev_tasks_status_index = {}
+
+
+# ---------------------------------------------------------------------------
+# WAL replay
+# ---------------------------------------------------------------------------
+
+class TestWalReplay:
+    def test_mutation_lands_in_wal_not_snapshot(self, tmp_agent_dir):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        log_path = tmp_agent_dir.data / "dev-tasks.log"
+        assert log_path.exists()
+        assert '"t1"' in log_path.read_text()
+        assert not (tmp_agent_dir.data / "dev-tasks.json").exists()
+
+    def test_cold_load_replays_wal(self, tmp_agent_dir):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        _mark_task_complete_json("t1")
+        _drop_memory_state()
+        data = _load_dev_tasks()
+        assert data["tasks"]["t1"]["status"] == "completed"
+
+    def test_replay_applies_on_top_of_snapshot(self, tmp_agent_dir):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        _save_dev_tasks(_load_dev_tasks())  # compact into the snapshot
+        _mark_task_complete_json("t1")  # lands in the fresh WAL
+        _drop_memory_state()
+        data = _load_dev_tasks()
+        assert data["tasks"]["t1"]["status"] == "completed"
+        assert data["tasks"]["t1"]["title"] == "Task one"
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+class TestCompaction:
+    def test_compaction_folds_wal_into_snapshot(self, tmp_agent_dir):
+        with patch("backend.agent._WAL_COMPACT_BYTES", 1):
+            _add_task_to_json("t1", "Task one", "content", "feature")
+            _mark_task_complete_json("t1")  # crosses the threshold
+        snapshot = json.loads((tmp_agent_dir.data / "dev-tasks.json").read_text())
+        assert snapshot["tasks"]["t1"]["status"] == "completed"
+
+    def test_compaction_truncates_wal_in_place(self, tmp_agent_dir):
+        with patch("backend.agent._WAL_COMPACT_BYTES", 1):
+            _add_task_to_json("t1", "Task one", "content", "feature")
+            _mark_task_complete_json("t1")
+        log_path = tmp_agent_dir.data / "dev-tasks.log"
+        # Truncated, not unlinked — worktree symlinks must stay valid.
+        assert log_path.exists()
+        assert log_path.read_text() == ""
+
+    def test_mutations_after_compaction_are_not_lost(self, tmp_agent_dir):
+        with patch("backend.agent._WAL_COMPACT_BYTES", 1):
+            _add_task_to_json("t1", "Task one", "content", "feature")
+            _mark_task_complete_json("t1")
+        _add_task_to_json("t2", "Task two", "content", "feature")
+        _drop_memory_state()
+        data = _load_dev_tasks()
+        assert data["tasks"]["t1"]["status"] == "completed"
+        assert data["tasks"]["t2"]["status"] == "pending"
+
+
+# ---------------------------------------------------------------------------
+# Cache invalidation
+# ---------------------------------------------------------------------------
+
+class TestCacheInvalidation:
+    def test_external_snapshot_write_is_picked_up(self, tmp_agent_dir):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        assert _load_dev_tasks()["tasks"]["t1"]["status"] == "pending"
+        # External writer (e.g. LocalConnector) compacts and rewrites.
+        external = {"tasks": {"t1": {"id": "t1", "title": "Task one",
+                                     "status": "failed"}}}
+        (tmp_agent_dir.data / "dev-tasks.json").write_text(json.dumps(external))
+        (tmp_agent_dir.data / "dev-tasks.log").write_text("")
+        data = _load_dev_tasks()
+        assert data["tasks"]["t1"]["status"] == "failed"
+
+    def test_status_index_tracks_mutations(self, tmp_agent_dir):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        assert [tid for tid, _ in agent._tasks_with_status("pending")] == ["t1"]
+        _mark_task_complete_json("t1")
+        assert agent._tasks_with_status("pending") == []
+        assert [tid for tid, _ in agent._tasks_with_status("completed")] == ["t1"]
+
+
+# ---------------------------------------------------------------------------
+# LocalConnector sees snapshot + WAL
+# ---------------------------------------------------------------------------
+
+class TestLocalConnectorReplay:
+    @pytest.fixture
+    def connector(self, tmp_agent_dir):
+        cfg = ProjectConfig(id="p", name="P", path=str(tmp_agent_dir.root))
+        return LocalConnector(cfg)
+
+    def test_list_tasks_includes_uncompacted_mutations(self, tmp_agent_dir, connector):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        _mark_task_complete_json("t1")
+        tasks = connector.list_tasks("completed")
+        assert [t.id for t in tasks] == ["t1"]
+        assert connector.list_tasks("pending") == []
+
+    def test_save_compacts_wal(self, tmp_agent_dir, connector):
+        _add_task_to_json("t1", "Task one", "content", "feature")
+        connector.create_task("Task two", "content")
+        # The connector's rewrite folded the WAL into the snapshot and
+        # truncated the log, so the agent cannot replay stale entries
+        # over it.
+        assert (tmp_agent_dir.data / "dev-tasks.log").read_text() == ""
+        snapshot = json.loads((tmp_agent_dir.data / "dev-tasks.json").read_text())
+        assert snapshot["tasks"]["t1"]["status"] == "pending"
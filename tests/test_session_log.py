@@ -0,0 +1,59 @@
+"""Tests for the session-log streaming endpoint.
+
+The route shares the /agent/tasks/ prefix with the {status}/{filename}
+catch-all, so these go through the full app router — a unit test on the
+handler alone would not catch registration-order shadowing.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.agent import AgentDir, app
+
+
+@pytest.fixture
+def tmp_agent_dir(tmp_path):
+    ad = AgentDir(root=tmp_path)
+    (tmp_path / "data").mkdir(parents=True)
+    with patch("backend.agent.agent_dir", ad):
+        yield ad
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestSessionLogRoute:
+    def test_streams_ndjson_sidecar_as_array(self, tmp_agent_dir, client):
+        events = [{"type": "assistant", "n": 1}, {"type": "result", "n": 2}]
+        (tmp_agent_dir.data / "abc12345.events.ndjson").write_text(
+            "".join(json.dumps(e) + "\n" for e in events)
+        )
+        resp = client.get("/agent/tasks/abc12345/session-log")
+        assert resp.status_code == 200
+        assert resp.json() == events
+
+    def test_legacy_log_json_yields_same_contract(self, tmp_agent_dir, client):
+        events = [{"type": "assistant", "n": 1}]
+        (tmp_agent_dir.data / "abc12345.log.json").write_text(
+            json.dumps({"summary": {"cost": 0}, "events": events})
+        )
+        resp = client.get("/agent/tasks/abc12345/session-log")
+        assert resp.status_code == 200
+        assert resp.json() == events
+
+    def test_missing_log_returns_404(self, tmp_agent_dir, client):
+        resp = client.get("/agent/tasks/abc12345/session-log")
+        assert resp.status_code == 404
+
+    def test_task_detail_route_not_shadowed(self, tmp_agent_dir, client):
+        # The session-log route is registered first; the two-segment
+        # catch-all must still serve real status/filename lookups.
+        resp = client.get("/agent/tasks/pending/missing.md")
+        assert resp.status_code == 404
+        assert resp.json()["detail"] == "Task not found"